@@ -4,7 +4,9 @@ Supply Chain Network Optimization Visualization
 """
 
 import streamlit as st
+import os
 import requests
+import orjson
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
@@ -19,6 +21,217 @@ st.set_page_config(
 # API endpoint
 API_URL = "http://localhost:8000"
 
+# Generated network map, served as text/html by the API's /map endpoint
+# (Streamlit's static server would send .html as text/plain)
+MAP_FILE = "static/network_map.html"
+MAP_URL = f"{API_URL}/map"
+
+# Refresh interval for the live KPI strip
+KPI_REFRESH = "60s"
+
+# Estimated one-time implementation cost, for ROI figures
+IMPLEMENTATION_COST = 50000
+
+@st.cache_resource
+def http():
+    """
+    Shared keep-alive session so calls reuse pooled connections
+    instead of opening a new TCP connection per request
+    """
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=8)
+    session.mount("http://", adapter)
+    return session
+
+def _get(path):
+    """
+    GET an API endpoint and return its JSON payload
+    """
+    # Fail fast on connect (API down) but allow slower responses
+    response = http().get(f"{API_URL}{path}", timeout=(2, 5))
+    if not response.ok:
+        # The API is up but refused the request: surface its error detail
+        try:
+            detail = orjson.loads(response.content)['detail']
+        except (orjson.JSONDecodeError, KeyError, TypeError):
+            detail = response.reason
+        raise requests.HTTPError(f"LogiFlow API error {response.status_code}: {detail}",
+                                 response=response)
+    return orjson.loads(response.content)
+
+@st.cache_data(ttl=300, max_entries=32)
+def fetch(path):
+    """
+    GET an API endpoint and return its JSON payload.
+    Cached so Streamlit reruns don't repeat the HTTP round-trip.
+    """
+    return _get(path)
+
+@st.cache_data(ttl=30, max_entries=8)
+def fetch_live(path):
+    """
+    Short-TTL variant of fetch() for panels on a refresh timer. The TTL is
+    half of KPI_REFRESH, so an entry has always expired by the next tick
+    and each tick fetches fresh data
+    """
+    return _get(path)
+
+@st.cache_data(ttl=10, max_entries=32)
+def fetch_safe(path, live=False):
+    """
+    fetch() (or fetch_live()) that returns None when the API is unreachable.
+    Failures are cached too, for 10 s, so while the API is down reruns
+    retry at most every 10 s instead of each paying a fresh timeout.
+    Successes still come from the underlying longer-lived cache.
+    HTTP errors from a running API are raised with the server's detail.
+    """
+    try:
+        return fetch_live(path) if live else fetch(path)
+    except (requests.ConnectionError, requests.Timeout):
+        return None
+
+@st.cache_data(max_entries=16)
+def to_frame(rows):
+    """
+    DataFrame from a list of row dicts, memoized on the (cached) payload
+    so reruns don't rebuild identical frames
+    """
+    return pd.DataFrame(rows)
+
+@st.cache_data(max_entries=8)
+def impact_metrics(baseline_cost, annual_savings, implementation_cost=IMPLEMENTATION_COST):
+    """
+    Savings percentage, ROI and payback period, derived once per payload.
+    The payback period is None when there are no savings to pay it back.
+    """
+    return {
+        "savings_pct": annual_savings / baseline_cost * 100,
+        "roi": annual_savings / implementation_cost * 100,
+        "payback_months": implementation_cost / annual_savings * 12 if annual_savings > 0 else None,
+    }
+
+def api(section):
+    """
+    One section (solution, warehouses, cost_breakdown, metrics, demand,
+    scenarios) of the dashboard bundle, fetched in a single round-trip
+    """
+    bundle = fetch_safe("/dashboard-bundle")
+    if bundle is None:
+        raise requests.ConnectionError(f"LogiFlow API unavailable at {API_URL}")
+    return bundle[section]
+
+# ==========================================
+# CHARTS
+# ==========================================
+# Figures are cached on the data they plot, so reruns reuse the built
+# figure until the payload changes
+
+@st.cache_data(max_entries=8)
+def cost_structure_fig(fixed_cost, variable_cost):
+    """Stacked fixed vs variable cost bar"""
+    fig = go.Figure(data=[
+        go.Bar(
+            name='Fixed Costs',
+            x=['Optimized'],
+            y=[fixed_cost],
+            marker_color='lightblue'
+        ),
+        go.Bar(
+            name='Variable Costs',
+            x=['Optimized'],
+            y=[variable_cost],
+            marker_color='coral'
+        )
+    ])
+    
+    fig.update_layout(
+        barmode='stack',
+        title='Cost Composition',
+        yaxis_title='Cost ($)',
+        height=400
+    )
+    return fig
+
+@st.cache_data(max_entries=8)
+def warehouse_cost_fig(wh_df):
+    """Per-warehouse fixed/variable cost bars"""
+    return px.bar(
+        wh_df,
+        x='warehouse',
+        y=['fixed_cost', 'variable_cost'],
+        title='Cost by Warehouse',
+        labels={'value': 'Cost ($)', 'variable': 'Cost Type'},
+        barmode='stack'
+    )
+
+@st.cache_data(max_entries=8)
+def regional_demand_fig(regional_df):
+    """Demand share by region"""
+    return px.pie(
+        regional_df,
+        values='demand',
+        names='region',
+        title='Demand by Region'
+    )
+
+@st.cache_data(max_entries=8)
+def top_cities_fig(cities_df):
+    """Horizontal bar of the highest-demand cities"""
+    return px.bar(
+        cities_df,
+        x='demand',
+        y='city',
+        orientation='h',
+        title='Top Cities'
+    )
+
+@st.cache_data(max_entries=8)
+def scenario_cost_fig(scenario_df, optimal_warehouses, optimal_cost):
+    """Total cost per warehouse-count scenario with the optimum starred"""
+    fig = go.Figure()
+    
+    fig.add_trace(go.Scatter(
+        x=scenario_df['max_warehouses'],
+        y=scenario_df['total_cost'],
+        mode='lines+markers',
+        name='Total Cost',
+        line=dict(color='red', width=3),
+        marker=dict(size=10)
+    ))
+    
+    # Mark optimal
+    fig.add_trace(go.Scatter(
+        x=[optimal_warehouses],
+        y=[optimal_cost],
+        mode='markers',
+        name='Optimal',
+        marker=dict(size=20, color='green', symbol='star')
+    ))
+    
+    fig.update_layout(
+        title='Cost vs Number of Warehouses',
+        xaxis_title='Number of Warehouses',
+        yaxis_title='Total Annual Cost ($)',
+        height=500
+    )
+    return fig
+
+@st.cache_data(max_entries=8)
+def cumulative_savings_fig(annual_savings, years=(1, 3, 5, 10)):
+    """Cumulative savings at several horizons"""
+    savings_data = {
+        'Year': list(years),
+        'Cumulative Savings': [annual_savings * y for y in years]
+    }
+    
+    return px.bar(
+        savings_data,
+        x='Year',
+        y='Cumulative Savings',
+        title='Cumulative Savings Over Time',
+        labels={'Cumulative Savings': 'Total Savings ($)'}
+    )
+
 # ==========================================
 # HEADER
 # ==========================================
@@ -33,19 +246,27 @@ st.markdown("---")
 
 st.sidebar.header("📊 Quick Stats")
 
-try:
-    response = requests.get(f"{API_URL}/solution")
-    if response.status_code == 200:
-        solution = response.json()
-        
-        st.sidebar.metric("Annual Savings", f"${solution['annual_savings']:,.0f}")
-        st.sidebar.metric("Cost Reduction", f"{solution['savings_percentage']:.1f}%")
-        st.sidebar.metric("Warehouses Needed", solution['num_warehouses'])
-        st.sidebar.metric("Total Routes", solution['num_routes'])
-    else:
-        st.sidebar.warning("Could not connect to API")
-except:
-    st.sidebar.error("❌ API not running. Start with: `python src/api/main.py`")
+@st.fragment(run_every=KPI_REFRESH)
+def quick_stats():
+    """
+    Headline KPIs; refreshes on its own timer without rerunning the page
+    """
+    try:
+        metrics = fetch_safe("/metrics", live=True)
+    except requests.HTTPError as e:
+        st.error(f"❌ {e}")
+        return
+    if metrics is None:
+        st.error("❌ API not running. Start with: `python src/api/main.py`")
+        return
+    
+    st.metric("Annual Savings", f"${metrics['cost_metrics']['annual_savings']:,.0f}")
+    st.metric("Cost Reduction", f"{metrics['cost_metrics']['savings_percentage']:.1f}%")
+    st.metric("Warehouses Needed", metrics['network_metrics']['num_warehouses'])
+    st.metric("Total Routes", metrics['network_metrics']['num_routes'])
+
+with st.sidebar:
+    quick_stats()
 
 st.sidebar.markdown("---")
 st.sidebar.markdown("**💡 Business Impact**")
@@ -67,7 +288,9 @@ tab1, tab2, tab3, tab4, tab5 = st.tabs([
 # TAB 1: Network Map
 # ==========================================
 
-with tab1:
+@st.fragment
+def render_network_map():
+    """Network map tab; reruns on its own when its widgets change"""
     st.header("Optimized Network Map")
     
     col1, col2 = st.columns([2, 1])
@@ -75,14 +298,13 @@ with tab1:
     with col1:
         st.markdown("### Interactive Network Visualization")
         
-        # Embed the HTML map
-        try:
-            with open('network_map.html', 'r') as f:
-                map_html = f.read()
-            st.components.v1.html(map_html, height=600, scrolling=True)
-        except:
+        # Embed the map by URL: the browser fetches (and caches) the file,
+        # instead of the full HTML being resent over the websocket each rerun
+        if os.path.exists(MAP_FILE):
+            st.components.v1.iframe(MAP_URL, height=600, scrolling=True)
+        else:
             st.warning("Map not found. Generate it first: `python src/visualization/network_map.py`")
-            st.info("Or view directly: Open `dashboards/network_map.html` in browser")
+            st.info("Or view directly: Open `dashboards/static/network_map.html` in browser")
     
     with col2:
         st.markdown("### Legend")
@@ -94,347 +316,280 @@ with tab1:
         """)
         
         try:
-            response = requests.get(f"{API_URL}/warehouses")
-            if response.status_code == 200:
-                warehouses = response.json()['warehouses']
-                
-                st.markdown("### Open Warehouses")
-                for wh in warehouses:
-                    if wh['is_open']:
-                        st.success(f"✓ {wh['name']}")
-                        st.caption(f"Region: {wh['region']}")
+            warehouses = api("warehouses")['warehouses']
+            
+            st.markdown("### Open Warehouses")
+            for wh in warehouses:
+                if wh['is_open']:
+                    st.success(f"✓ {wh['name']}")
+                    st.caption(f"Region: {wh['region']}")
         except:
             pass
 
+with tab1:
+    render_network_map()
+
 # ==========================================
 # TAB 2: Cost Analysis
 # ==========================================
 
-with tab2:
+@st.fragment
+def render_cost_analysis():
+    """Cost analysis tab; reruns on its own when its widgets change"""
     st.header("Cost Breakdown & Analysis")
     
     try:
-        response = requests.get(f"{API_URL}/cost-breakdown")
-        if response.status_code == 200:
-            cost_data = response.json()
-            
-            # High-level comparison
-            col1, col2, col3 = st.columns(3)
-            
-            with col1:
-                st.metric(
-                    "Baseline Cost",
-                    f"${cost_data['baseline_cost']:,.0f}",
-                    delta=None
-                )
-            
-            with col2:
-                st.metric(
-                    "Optimized Cost",
-                    f"${cost_data['optimized_cost']:,.0f}",
-                    delta=f"-${cost_data['savings']:,.0f}",
-                    delta_color="inverse"
-                )
-            
-            with col3:
-                savings_pct = (cost_data['savings'] / cost_data['baseline_cost'] * 100)
-                st.metric(
-                    "Savings",
-                    f"${cost_data['savings']:,.0f}",
-                    delta=f"{savings_pct:.1f}% reduction"
-                )
-            
-            # Cost breakdown chart
-            st.markdown("### Cost Structure")
-            
-            fig = go.Figure(data=[
-                go.Bar(
-                    name='Fixed Costs',
-                    x=['Optimized'],
-                    y=[cost_data['fixed_cost_total']],
-                    marker_color='lightblue'
-                ),
-                go.Bar(
-                    name='Variable Costs',
-                    x=['Optimized'],
-                    y=[cost_data['variable_cost_total']],
-                    marker_color='coral'
-                )
-            ])
-            
-            fig.update_layout(
-                barmode='stack',
-                title='Cost Composition',
-                yaxis_title='Cost ($)',
-                height=400
+        cost_data = api("cost_breakdown")
+        
+        # High-level comparison
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            st.metric(
+                "Baseline Cost",
+                f"${cost_data['baseline_cost']:,.0f}",
+                delta=None
             )
-            
-            st.plotly_chart(fig, use_container_width=True)
-            
-            # Per-warehouse breakdown
-            st.markdown("### Per-Warehouse Analysis")
-            wh_df = pd.DataFrame(cost_data['warehouse_breakdown'])
-            
-            fig2 = px.bar(
-                wh_df,
-                x='warehouse',
-                y=['fixed_cost', 'variable_cost'],
-                title='Cost by Warehouse',
-                labels={'value': 'Cost ($)', 'variable': 'Cost Type'},
-                barmode='stack'
+        
+        with col2:
+            st.metric(
+                "Optimized Cost",
+                f"${cost_data['optimized_cost']:,.0f}",
+                delta=f"-${cost_data['savings']:,.0f}",
+                delta_color="inverse"
             )
-            st.plotly_chart(fig2, use_container_width=True)
-            
-            # Table
-            st.markdown("### Detailed Breakdown")
-            st.dataframe(
-                wh_df.style.format({
-                    'fixed_cost': '${:,.0f}',
-                    'variable_cost': '${:,.0f}',
-                    'total_cost': '${:,.0f}',
-                    'total_shipments': '{:,.0f}'
-                }),
-                use_container_width=True
+        
+        with col3:
+            savings_pct = impact_metrics(cost_data['baseline_cost'], cost_data['savings'])['savings_pct']
+            st.metric(
+                "Savings",
+                f"${cost_data['savings']:,.0f}",
+                delta=f"{savings_pct:.1f}% reduction"
             )
-            
+        
+        # Cost breakdown chart
+        st.markdown("### Cost Structure")
+        
+        fig = cost_structure_fig(cost_data['fixed_cost_total'], cost_data['variable_cost_total'])
+        st.plotly_chart(fig, use_container_width=True)
+        
+        # Per-warehouse breakdown
+        st.markdown("### Per-Warehouse Analysis")
+        wh_df = to_frame(cost_data['warehouse_breakdown'])
+        
+        fig2 = warehouse_cost_fig(wh_df)
+        st.plotly_chart(fig2, use_container_width=True)
+        
+        # Table
+        st.markdown("### Detailed Breakdown")
+        st.dataframe(
+            wh_df.style.format({
+                'fixed_cost': '${:,.0f}',
+                'variable_cost': '${:,.0f}',
+                'total_cost': '${:,.0f}',
+                'total_shipments': '{:,.0f}'
+            }),
+            use_container_width=True
+        )
+        
     except Exception as e:
         st.error(f"Could not load cost data: {str(e)}")
 
+with tab2:
+    render_cost_analysis()
+
 # ==========================================
 # TAB 3: Performance Metrics
 # ==========================================
 
-with tab3:
+@st.fragment
+def render_performance_metrics():
+    """Performance metrics tab; reruns on its own when its widgets change"""
     st.header("Network Performance Metrics")
     
     try:
-        response = requests.get(f"{API_URL}/metrics")
-        if response.status_code == 200:
-            metrics = response.json()
-            
-            # Cost metrics
-            st.markdown("### 💰 Cost Metrics")
-            col1, col2, col3, col4 = st.columns(4)
-            
-            with col1:
-                st.metric("Annual Savings", f"${metrics['cost_metrics']['annual_savings']:,.0f}")
-            with col2:
-                st.metric("Savings %", f"{metrics['cost_metrics']['savings_percentage']:.1f}%")
-            with col3:
-                st.metric("Cost/Shipment", f"${metrics['cost_metrics']['cost_per_shipment']:.2f}")
-            with col4:
-                st.metric("Optimized Cost", f"${metrics['cost_metrics']['optimized_cost']:,.0f}")
-            
-            # Network metrics
-            st.markdown("### 🏭 Network Metrics")
-            col1, col2, col3, col4 = st.columns(4)
-            
-            with col1:
-                st.metric("Warehouses", metrics['network_metrics']['num_warehouses'])
-            with col2:
-                st.metric("Active Routes", metrics['network_metrics']['num_routes'])
-            with col3:
-                st.metric("Total Shipments", f"{metrics['network_metrics']['total_shipments']:,.0f}")
-            with col4:
-                st.metric("Customers Served", metrics['network_metrics']['num_customers_served'])
-            
-            # Efficiency metrics
-            st.markdown("### ⚡ Efficiency Metrics")
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.metric("Network Utilization", f"{metrics['efficiency_metrics']['utilization_rate']:.1f}%")
-            with col2:
-                st.metric("Fixed/Variable Ratio", f"{metrics['efficiency_metrics']['fixed_to_variable_ratio']:.2f}")
-            
-            # Demand distribution
-            st.markdown("### 📍 Demand Distribution")
-            demand_response = requests.get(f"{API_URL}/demand")
-            if demand_response.status_code == 200:
-                demand_data = demand_response.json()
-                
-                # Regional pie chart
-                regional_df = pd.DataFrame([
-                    {'region': k, 'demand': v} 
-                    for k, v in demand_data['regional_demand'].items()
-                ])
-                
-                fig = px.pie(
-                    regional_df,
-                    values='demand',
-                    names='region',
-                    title='Demand by Region'
-                )
-                st.plotly_chart(fig, use_container_width=True)
-                
-                # Top cities
-                st.markdown("### 🌆 Top 10 Cities by Demand")
-                cities_df = pd.DataFrame(demand_data['top_cities'])
-                
-                fig2 = px.bar(
-                    cities_df,
-                    x='demand',
-                    y='city',
-                    orientation='h',
-                    title='Top Cities'
-                )
-                st.plotly_chart(fig2, use_container_width=True)
-            
+        metrics = api("metrics")
+        
+        # Cost metrics
+        st.markdown("### 💰 Cost Metrics")
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            st.metric("Annual Savings", f"${metrics['cost_metrics']['annual_savings']:,.0f}")
+        with col2:
+            st.metric("Savings %", f"{metrics['cost_metrics']['savings_percentage']:.1f}%")
+        with col3:
+            st.metric("Cost/Shipment", f"${metrics['cost_metrics']['cost_per_shipment']:.2f}")
+        with col4:
+            st.metric("Optimized Cost", f"${metrics['cost_metrics']['optimized_cost']:,.0f}")
+        
+        # Network metrics
+        st.markdown("### 🏭 Network Metrics")
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            st.metric("Warehouses", metrics['network_metrics']['num_warehouses'])
+        with col2:
+            st.metric("Active Routes", metrics['network_metrics']['num_routes'])
+        with col3:
+            st.metric("Total Shipments", f"{metrics['network_metrics']['total_shipments']:,.0f}")
+        with col4:
+            st.metric("Customers Served", metrics['network_metrics']['num_customers_served'])
+        
+        # Efficiency metrics
+        st.markdown("### ⚡ Efficiency Metrics")
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.metric("Network Utilization", f"{metrics['efficiency_metrics']['utilization_rate']:.1f}%")
+        with col2:
+            st.metric("Fixed/Variable Ratio", f"{metrics['efficiency_metrics']['fixed_to_variable_ratio']:.2f}")
+        
+        # Demand distribution
+        st.markdown("### 📍 Demand Distribution")
+        demand_data = api("demand")
+        
+        # Regional pie chart
+        regional_df = to_frame([
+            {'region': k, 'demand': v} 
+            for k, v in demand_data['regional_demand'].items()
+        ])
+        
+        fig = regional_demand_fig(regional_df)
+        st.plotly_chart(fig, use_container_width=True)
+        
+        # Top cities
+        st.markdown("### 🌆 Top 10 Cities by Demand")
+        cities_df = to_frame(demand_data['top_cities'])
+        
+        fig2 = top_cities_fig(cities_df)
+        st.plotly_chart(fig2, use_container_width=True)
+        
     except Exception as e:
         st.error(f"Could not load metrics: {str(e)}")
 
+with tab3:
+    render_performance_metrics()
+
 # ==========================================
 # TAB 4: Scenario Comparison
 # ==========================================
 
-with tab4:
+@st.fragment
+def render_scenarios():
+    """Scenario comparison tab; reruns on its own when its widgets change"""
     st.header("Scenario Analysis: Impact of Warehouse Count")
     
     try:
-        response = requests.get(f"{API_URL}/scenarios")
-        if response.status_code == 200:
-            scenarios = response.json()
-            scenario_df = pd.DataFrame(scenarios['scenarios'])
-            
-            # Line chart
-            fig = go.Figure()
-            
-            fig.add_trace(go.Scatter(
-                x=scenario_df['max_warehouses'],
-                y=scenario_df['total_cost'],
-                mode='lines+markers',
-                name='Total Cost',
-                line=dict(color='red', width=3),
-                marker=dict(size=10)
-            ))
-            
-            # Mark optimal
-            optimal = scenarios['optimal']
-            fig.add_trace(go.Scatter(
-                x=[optimal['warehouses']],
-                y=[optimal['cost']],
-                mode='markers',
-                name='Optimal',
-                marker=dict(size=20, color='green', symbol='star')
-            ))
-            
-            fig.update_layout(
-                title='Cost vs Number of Warehouses',
-                xaxis_title='Number of Warehouses',
-                yaxis_title='Total Annual Cost ($)',
-                height=500
-            )
-            
-            st.plotly_chart(fig, use_container_width=True)
-            
-            # Optimal solution highlight
-            st.success(f"✨ **Optimal Solution:** {optimal['warehouses']} warehouses at ${optimal['cost']:,.0f}/year")
-            
-            # Data table
-            st.markdown("### Scenario Comparison Table")
-            st.dataframe(
-                scenario_df.style.format({
-                    'total_cost': '${:,.0f}',
-                    'fixed_cost': '${:,.0f}',
-                    'variable_cost': '${:,.0f}'
-                }),
-                use_container_width=True
-            )
-            
+        scenarios = api("scenarios")
+        scenario_df = to_frame(scenarios['scenarios'])
+        
+        # Line chart, optimal marked
+        optimal = scenarios['optimal']
+        fig = scenario_cost_fig(scenario_df, optimal['warehouses'], optimal['cost'])
+        
+        st.plotly_chart(fig, use_container_width=True)
+        
+        # Optimal solution highlight
+        st.success(f"✨ **Optimal Solution:** {optimal['warehouses']} warehouses at ${optimal['cost']:,.0f}/year")
+        
+        # Data table
+        st.markdown("### Scenario Comparison Table")
+        st.dataframe(
+            scenario_df.style.format({
+                'total_cost': '${:,.0f}',
+                'fixed_cost': '${:,.0f}',
+                'variable_cost': '${:,.0f}'
+            }),
+            use_container_width=True
+        )
+        
     except Exception as e:
         st.error(f"Could not load scenarios: {str(e)}")
 
+with tab4:
+    render_scenarios()
+
 # ==========================================
 # TAB 5: Business Impact
 # ==========================================
 
-with tab5:
+@st.fragment
+def render_business_impact():
+    """Business impact tab; reruns on its own when its widgets change"""
     st.header("Business Impact & ROI Analysis")
     
     try:
-        response = requests.get(f"{API_URL}/solution")
-        if response.status_code == 200:
-            solution = response.json()
-            
-            # Key impact metrics
-            st.markdown("### 💰 Financial Impact")
-            
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.markdown("#### Before Optimization")
-                st.metric("Annual Cost", f"${solution['baseline_cost']:,.0f}")
-                st.metric("Warehouses", "10")
-                st.caption("All potential warehouses open")
-            
-            with col2:
-                st.markdown("#### After Optimization")
-                st.metric("Annual Cost", f"${solution['optimized_cost']:,.0f}")
-                st.metric("Warehouses", solution['num_warehouses'])
-                st.caption("Optimized warehouse selection")
-            
-            # Savings breakdown
-            st.markdown("### 📊 Savings Projection")
-            
-            years = [1, 3, 5, 10]
-            annual_savings = solution['annual_savings']
-            
-            savings_data = {
-                'Year': years,
-                'Cumulative Savings': [annual_savings * y for y in years]
-            }
-            
-            fig = px.bar(
-                savings_data,
-                x='Year',
-                y='Cumulative Savings',
-                title='Cumulative Savings Over Time',
-                labels={'Cumulative Savings': 'Total Savings ($)'}
-            )
-            
-            st.plotly_chart(fig, use_container_width=True)
-            
-            # ROI calculation
-            st.markdown("### 📈 Return on Investment")
-            
-            implementation_cost = 50000  # Estimated implementation cost
-            roi = (annual_savings / implementation_cost) * 100
-            payback_months = (implementation_cost / annual_savings) * 12
-            
-            col1, col2, col3 = st.columns(3)
-            
-            with col1:
-                st.metric("Implementation Cost", f"${implementation_cost:,.0f}")
-            with col2:
-                st.metric("ROI", f"{roi:,.0f}%")
-            with col3:
-                st.metric("Payback Period", f"{payback_months:.1f} months")
-            
-            # Business benefits
-            st.markdown("### ✨ Key Benefits")
-            
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.success(f"""
-                **Cost Savings:**
-                - Annual: ${annual_savings:,.0f}
-                - 5-Year: ${annual_savings * 5:,.0f}
-                - Reduction: {solution['savings_percentage']:.1f}%
-                """)
-            
-            with col2:
-                st.info("""
-                **Operational Benefits:**
-                - Simplified network management
-                - Reduced fixed overhead
-                - Strategic positioning
-                - Scalable infrastructure
-                """)
-            
+        solution = api("solution")
+        
+        # Key impact metrics
+        st.markdown("### 💰 Financial Impact")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.markdown("#### Before Optimization")
+            st.metric("Annual Cost", f"${solution['baseline_cost']:,.0f}")
+            st.metric("Warehouses", "10")
+            st.caption("All potential warehouses open")
+        
+        with col2:
+            st.markdown("#### After Optimization")
+            st.metric("Annual Cost", f"${solution['total_cost']:,.0f}")
+            st.metric("Warehouses", solution['num_warehouses'])
+            st.caption("Optimized warehouse selection")
+        
+        # Savings breakdown
+        st.markdown("### 📊 Savings Projection")
+        
+        annual_savings = solution['annual_savings']
+        
+        fig = cumulative_savings_fig(annual_savings)
+        st.plotly_chart(fig, use_container_width=True)
+        
+        # ROI calculation
+        st.markdown("### 📈 Return on Investment")
+        
+        impact = impact_metrics(solution['baseline_cost'], annual_savings)
+        
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            st.metric("Implementation Cost", f"${IMPLEMENTATION_COST:,.0f}")
+        with col2:
+            st.metric("ROI", f"{impact['roi']:,.0f}%")
+        with col3:
+            payback = impact['payback_months']
+            st.metric("Payback Period", f"{payback:.1f} months" if payback is not None else "N/A")
+        
+        # Business benefits
+        st.markdown("### ✨ Key Benefits")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.success(f"""
+            **Cost Savings:**
+            - Annual: ${annual_savings:,.0f}
+            - 5-Year: ${annual_savings * 5:,.0f}
+            - Reduction: {solution['savings_percentage']:.1f}%
+            """)
+        
+        with col2:
+            st.info("""
+            **Operational Benefits:**
+            - Simplified network management
+            - Reduced fixed overhead
+            - Strategic positioning
+            - Scalable infrastructure
+            """)
+        
     except Exception as e:
         st.error(f"Could not load business impact data: {str(e)}")
 
+with tab5:
+    render_business_impact()
+
 # ==========================================
 # FOOTER
 # ==========================================
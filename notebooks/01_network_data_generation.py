@@ -6,11 +6,19 @@ Based on 20+ years of supply chain industry patterns
 
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
 import os
 from datetime import datetime, timedelta
 
-# Set random seed for reproducibility
-np.random.seed(42)
+# Optional: Numba JIT for the distance/cost kernel on large networks
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+# Seeded generator for reproducibility
+rng = np.random.default_rng(42)
 
 # ==========================================
 # BUSINESS PARAMETERS (E-Commerce Company)
@@ -70,6 +78,20 @@ SERVICE_LEVELS = {
     'Overnight': {'days': 1, 'cost_multiplier': 3.0, 'demand_share': 0.10},
 }
 
+# Structured-array views of the locations above, so vectorized code reads
+# contiguous columns (CITIES['lat']) instead of per-entry dict lookups
+CITIES = np.array(
+    [(name, info['lat'], info['lon'], info['region'], info['population'])
+     for name, info in DEMAND_CENTERS.items()],
+    dtype=[('name', 'U20'), ('lat', 'f8'), ('lon', 'f8'), ('region', 'U10'), ('population', 'i4')]
+)
+
+WAREHOUSES = np.array(
+    [(name, info['lat'], info['lon'], info['region'], info['fixed_cost'])
+     for name, info in WAREHOUSE_LOCATIONS.items()],
+    dtype=[('name', 'U20'), ('lat', 'f8'), ('lon', 'f8'), ('region', 'U10'), ('fixed_cost', 'i4')]
+)
+
 # ==========================================
 # HELPER FUNCTIONS
 # ==========================================
@@ -93,21 +115,68 @@ def calculate_transport_cost(distance_km, weight_kg, service_level='Standard'):
     """
     Calculate transportation cost based on distance and weight
     Industry standard: ~$0.50-$1.50 per km per ton
+    Accepts scalars or NumPy arrays for distance_km
     """
     base_rate = 1.0  # $/km/ton
     weight_tons = weight_kg / 1000
     service_multiplier = SERVICE_LEVELS[service_level]['cost_multiplier']
     
     # Add distance premium for very long routes
-    if distance_km > 2000:
-        distance_multiplier = 1.3
-    elif distance_km > 1000:
-        distance_multiplier = 1.1
-    else:
-        distance_multiplier = 1.0
+    distance_multiplier = np.where(distance_km > 2000, 1.3,
+                                   np.where(distance_km > 1000, 1.1, 1.0))
     
     cost = base_rate * distance_km * weight_tons * service_multiplier * distance_multiplier
-    return round(cost, 2)
+    return np.round(cost, 2)
+
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def _distance_cost_kernel(wh_lat, wh_lon, city_lat, city_lon, weight_kg, service_multipliers):
+        """
+        Fused haversine + transport cost over every (warehouse, city, service)
+        in one pass, parallel over warehouses. Same arithmetic as
+        haversine_distance/calculate_transport_cost, without the O(W*C)
+        temporaries NumPy broadcasting allocates per expression.
+        Returns (distances, unrounded costs).
+        """
+        R = 6371  # Earth radius in km
+        base_rate = 1.0  # $/km/ton
+        weight_tons = weight_kg / 1000
+        
+        n_wh, n_city, n_service = wh_lat.shape[0], city_lat.shape[0], service_multipliers.shape[0]
+        distances = np.empty((n_wh, n_city))
+        costs = np.empty((n_wh, n_city, n_service))
+        
+        for i in prange(n_wh):
+            lat1 = np.radians(wh_lat[i])
+            lon1 = np.radians(wh_lon[i])
+            for j in range(n_city):
+                lat2 = np.radians(city_lat[j])
+                lon2 = np.radians(city_lon[j])
+                a = np.sin((lat2 - lat1)/2)**2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1)/2)**2
+                d = R * (2 * np.arcsin(np.sqrt(a)))
+                distances[i, j] = d
+                
+                if d > 2000:
+                    distance_multiplier = 1.3
+                elif d > 1000:
+                    distance_multiplier = 1.1
+                else:
+                    distance_multiplier = 1.0
+                
+                for k in range(n_service):
+                    costs[i, j, k] = base_rate * d * weight_tons * service_multipliers[k] * distance_multiplier
+        
+        return distances, costs
+
+def save_frame(df, csv_path, compression='snappy'):
+    """
+    Save a frame as CSV plus a compressed Parquet copy alongside it.
+    The CSV keeps pandas' to_csv layout so the committed files stay stable;
+    the Parquet copy keeps Categorical/downcast dtypes and loads much faster.
+    """
+    df.to_csv(csv_path, index=False)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    pq.write_table(table, csv_path.replace('.csv', '.parquet'), compression=compression)
 
 # ==========================================
 # DATA GENERATION
@@ -118,101 +187,141 @@ def generate_demand_data(start_date='2024-01-01', end_date='2024-12-31'):
     Generate daily demand for each city
     """
     date_range = pd.date_range(start=start_date, end=end_date, freq='D')
-    data = []
+    month = date_range.month
     
-    for date in date_range:
-        month = date.month
-        day_of_week = date.strftime('%A')
-        is_weekend = day_of_week in ['Saturday', 'Sunday']
-        
-        # Seasonal multipliers
-        if month in [11, 12]:  # Holiday season
-            seasonal_mult = 1.5
-        elif month in [6, 7, 8]:  # Summer
-            seasonal_mult = 1.2
-        else:
-            seasonal_mult = 1.0
-        
-        # Day of week multiplier
-        dow_mult = 1.3 if is_weekend else 1.0
-        
-        for city, info in DEMAND_CENTERS.items():
-            # Base demand proportional to population
-            base_demand = info['population'] / 10000  # ~1 order per 10k people
-            
-            for category, cat_info in PRODUCT_CATEGORIES.items():
-                # Category popularity varies by city
-                if category == 'Electronics' and info['region'] == 'West':
-                    category_mult = 1.3  # Tech hubs
-                elif category == 'Apparel' and info['region'] == 'Northeast':
-                    category_mult = 1.2  # Fashion centers
-                else:
-                    category_mult = 1.0
-                
-                # Calculate demand
-                expected_demand = base_demand * seasonal_mult * dow_mult * category_mult * 0.2  # 20% of base per category
-                
-                # Add noise
-                noise = np.random.normal(1.0, 0.15)
-                actual_demand = max(0, int(expected_demand * noise))
-                
-                # Distribute across service levels
-                for service, service_info in SERVICE_LEVELS.items():
-                    service_demand = int(actual_demand * service_info['demand_share'])
-                    
-                    if service_demand > 0:
-                        data.append({
-                            'date': date,
-                            'city': city,
-                            'lat': info['lat'],
-                            'lon': info['lon'],
-                            'region': info['region'],
-                            'category': category,
-                            'service_level': service,
-                            'demand': service_demand,
-                            'weight_per_unit_kg': cat_info['weight_kg'],
-                            'value_per_unit': cat_info['value'],
-                            'total_weight_kg': service_demand * cat_info['weight_kg'],
-                            'total_value': service_demand * cat_info['value'],
-                        })
+    dates_df = pd.DataFrame({
+        'date': date_range,
+        # Seasonal multipliers: holiday season, then summer
+        'seasonal_mult': np.where(month.isin([11, 12]), 1.5,
+                                  np.where(month.isin([6, 7, 8]), 1.2, 1.0)),
+        # Day of week multiplier (weekends)
+        'dow_mult': np.where(date_range.dayofweek >= 5, 1.3, 1.0),
+    })
+    
+    cities_df = pd.DataFrame({
+        'city': CITIES['name'],
+        'lat': CITIES['lat'],
+        'lon': CITIES['lon'],
+        'region': CITIES['region'],
+        'base_demand': CITIES['population'] / 10000,  # ~1 order per 10k people
+    })
+    
+    categories_df = pd.DataFrame([
+        {
+            'category': category,
+            'weight_per_unit_kg': cat_info['weight_kg'],
+            'value_per_unit': cat_info['value'],
+        }
+        for category, cat_info in PRODUCT_CATEGORIES.items()
+    ])
+    
+    services_df = pd.DataFrame([
+        {'service_level': service, 'demand_share': service_info['demand_share']}
+        for service, service_info in SERVICE_LEVELS.items()
+    ])
+    
+    # One row per (date, city, category), date-major like a nested loop
+    df = dates_df.merge(cities_df, how='cross').merge(categories_df, how='cross')
     
-    return pd.DataFrame(data)
+    # Category popularity varies by city
+    category_mult = np.where(
+        (df['category'] == 'Electronics') & (df['region'] == 'West'), 1.3,  # Tech hubs
+        np.where((df['category'] == 'Apparel') & (df['region'] == 'Northeast'), 1.2,  # Fashion centers
+                 1.0))
+    
+    # Calculate demand
+    expected_demand = df['base_demand'] * df['seasonal_mult'] * df['dow_mult'] * category_mult * 0.2  # 20% of base per category
+    
+    # Add noise: one draw per (date, city, category), laid out to match df
+    noise = rng.normal(1.0, 0.15, size=(len(dates_df), len(cities_df), len(categories_df)))
+    noise = noise.ravel()
+    df['actual_demand'] = np.maximum(0, expected_demand * noise).astype(int)
+    
+    # Distribute across service levels
+    df = df.merge(services_df, how='cross')
+    df['demand'] = (df['actual_demand'] * df['demand_share']).astype(int)
+    
+    df = df[df['demand'] > 0].assign(
+        total_weight_kg=lambda d: d['demand'] * d['weight_per_unit_kg'],
+        total_value=lambda d: d['demand'] * d['value_per_unit'],
+    )
+    
+    df = df[[
+        'date', 'city', 'lat', 'lon', 'region', 'category', 'service_level',
+        'demand', 'weight_per_unit_kg', 'value_per_unit',
+        'total_weight_kg', 'total_value',
+    ]].reset_index(drop=True)
+    
+    # Low-cardinality labels as Categorical: int8 codes instead of str objects
+    for col in ['city', 'region', 'category', 'service_level']:
+        df[col] = df[col].astype('category')
+    
+    # Downcast the integral columns to int32 (counts, whole-dollar prices and
+    # values). Coordinates and weights stay float64 so sums and downstream
+    # costs are not perturbed by float32 rounding.
+    df = df.astype({
+        'demand': 'int32',
+        'value_per_unit': 'int32',
+        'total_value': 'int32',
+    })
+    
+    return df
 
 def generate_distance_matrix():
     """
     Calculate distances between all warehouses and demand centers
     """
-    data = []
+    wh_names, wh_lat, wh_lon = WAREHOUSES['name'], WAREHOUSES['lat'], WAREHOUSES['lon']
+    wh_region, wh_fixed_cost = WAREHOUSES['region'], WAREHOUSES['fixed_cost']
     
-    for wh_name, wh_info in WAREHOUSE_LOCATIONS.items():
-        for city_name, city_info in DEMAND_CENTERS.items():
-            distance = haversine_distance(
-                wh_info['lat'], wh_info['lon'],
-                city_info['lat'], city_info['lon']
-            )
-            
-            # Calculate costs for different service levels
-            for service, service_info in SERVICE_LEVELS.items():
-                avg_weight = 2.0  # Average shipment weight in kg
-                transport_cost = calculate_transport_cost(distance, avg_weight, service)
-                
-                data.append({
-                    'warehouse': wh_name,
-                    'warehouse_lat': wh_info['lat'],
-                    'warehouse_lon': wh_info['lon'],
-                    'warehouse_region': wh_info['region'],
-                    'warehouse_fixed_cost': wh_info['fixed_cost'],
-                    'customer_city': city_name,
-                    'customer_lat': city_info['lat'],
-                    'customer_lon': city_info['lon'],
-                    'customer_region': city_info['region'],
-                    'distance_km': round(distance, 2),
-                    'service_level': service,
-                    'service_days': service_info['days'],
-                    'transport_cost_per_shipment': transport_cost,
-                })
+    city_names, city_lat, city_lon = CITIES['name'], CITIES['lat'], CITIES['lon']
+    city_region = CITIES['region']
     
-    return pd.DataFrame(data)
+    services = np.array(list(SERVICE_LEVELS.keys()))
+    service_days = np.array([info['days'] for info in SERVICE_LEVELS.values()])
+    
+    avg_weight = 2.0  # Average shipment weight in kg
+    
+    if njit is not None:
+        # Fused JIT kernel: one pass, no per-expression temporaries
+        service_multipliers = np.array([info['cost_multiplier'] for info in SERVICE_LEVELS.values()])
+        distances, costs = _distance_cost_kernel(wh_lat, wh_lon, city_lat, city_lon,
+                                                 avg_weight, service_multipliers)
+        costs = np.round(costs, 2)
+    else:
+        # Full warehouse x city distance matrix in one broadcast haversine call
+        distances = haversine_distance(wh_lat[:, None], wh_lon[:, None],
+                                       city_lat[None, :], city_lon[None, :])
+        
+        # Transport cost for every (warehouse, city, service level) at once
+        costs = np.stack([
+            calculate_transport_cost(distances, avg_weight, service)
+            for service in services
+        ], axis=-1)
+    
+    # Rows are ordered warehouse -> city -> service level
+    n_wh, n_city, n_service = costs.shape
+    per_wh = n_city * n_service
+    
+    distance_df = pd.DataFrame({
+        'warehouse': np.repeat(wh_names, per_wh),
+        'warehouse_lat': np.repeat(wh_lat, per_wh),
+        'warehouse_lon': np.repeat(wh_lon, per_wh),
+        'warehouse_region': np.repeat(wh_region, per_wh),
+        'warehouse_fixed_cost': np.repeat(wh_fixed_cost, per_wh),
+        'customer_city': np.tile(np.repeat(city_names, n_service), n_wh),
+        'customer_lat': np.tile(np.repeat(city_lat, n_service), n_wh),
+        'customer_lon': np.tile(np.repeat(city_lon, n_service), n_wh),
+        'customer_region': np.tile(np.repeat(city_region, n_service), n_wh),
+        'distance_km': np.repeat(np.round(distances, 2).ravel(), n_service),
+        'service_level': np.tile(services, n_wh * n_city),
+        'service_days': np.tile(service_days, n_wh * n_city),
+        'transport_cost_per_shipment': costs.ravel(),
+    })
+    
+    # Distances and per-shipment costs stay float64: they are money and
+    # distance values that reach the model's objective coefficients
+    return distance_df
 
 # ==========================================
 # GENERATE AND SAVE DATA
@@ -236,48 +345,60 @@ print("\n" + "=" * 70)
 print("📊 BUSINESS METRICS SUMMARY")
 print("=" * 70)
 
-total_demand = demand_df['demand'].sum()
-total_value = demand_df['total_value'].sum()
-total_weight = demand_df['total_weight_kg'].sum()
-
-print(f"\nDemand Centers: {len(DEMAND_CENTERS)}")
-print(f"Potential Warehouses: {len(WAREHOUSE_LOCATIONS)}")
-print(f"Product Categories: {len(PRODUCT_CATEGORIES)}")
-print(f"\nAnnual Demand: {total_demand:,} orders")
-print(f"Total Value: ${total_value:,.2f}")
-print(f"Total Weight: {total_weight:,.0f} kg")
+# One pass over the daily rows; every breakdown below (and the aggregated
+# demand saved later) is a cheap re-aggregation of this small cube
+LOCATION_KEYS = ['city', 'lat', 'lon', 'region', 'service_level']
+demand_cube = demand_df.groupby(LOCATION_KEYS + ['category'], observed=True).agg({
+    'demand': 'sum',
+    'total_weight_kg': 'sum',
+    'total_value': 'sum'
+})
+
+total_demand = demand_cube['demand'].sum()
+total_value = demand_cube['total_value'].sum()
+total_weight = demand_cube['total_weight_kg'].sum()
+
+# Summary lines are collected and written in one print at the end
+lines = [
+    f"\nDemand Centers: {len(DEMAND_CENTERS)}",
+    f"Potential Warehouses: {len(WAREHOUSE_LOCATIONS)}",
+    f"Product Categories: {len(PRODUCT_CATEGORIES)}",
+    f"\nAnnual Demand: {total_demand:,} orders",
+    f"Total Value: ${total_value:,.2f}",
+    f"Total Weight: {total_weight:,.0f} kg",
+]
 
 # Regional demand breakdown
-print("\n📍 Regional Demand Distribution:")
-regional_demand = demand_df.groupby('region')['demand'].sum().sort_values(ascending=False)
-for region, demand in regional_demand.items():
-    percentage = (demand / total_demand * 100)
-    print(f"   {region:15s} {demand:8,} orders ({percentage:5.1f}%)")
+lines.append("\n📍 Regional Demand Distribution:")
+regional_demand = demand_cube.groupby(level='region', observed=True)['demand'].sum().sort_values(ascending=False)
+lines += [f"   {region:15s} {demand:8,} orders ({demand / total_demand * 100:5.1f}%)"
+          for region, demand in regional_demand.items()]
 
 # Service level breakdown
-print("\n🚚 Service Level Mix:")
-service_demand = demand_df.groupby('service_level')['demand'].sum()
-for service, demand in service_demand.items():
-    percentage = (demand / total_demand * 100)
-    print(f"   {service:15s} {demand:8,} orders ({percentage:5.1f}%)")
+lines.append("\n🚚 Service Level Mix:")
+service_demand = demand_cube.groupby(level='service_level', observed=True)['demand'].sum()
+lines += [f"   {service:15s} {demand:8,} orders ({demand / total_demand * 100:5.1f}%)"
+          for service, demand in service_demand.items()]
 
 # Category breakdown
-print("\n📦 Product Category Mix:")
-category_demand = demand_df.groupby('category')['demand'].sum().sort_values(ascending=False)
-for category, demand in category_demand.items():
-    percentage = (demand / total_demand * 100)
-    print(f"   {category:15s} {demand:8,} orders ({percentage:5.1f}%)")
+lines.append("\n📦 Product Category Mix:")
+category_demand = demand_cube.groupby(level='category', observed=True)['demand'].sum().sort_values(ascending=False)
+lines += [f"   {category:15s} {demand:8,} orders ({demand / total_demand * 100:5.1f}%)"
+          for category, demand in category_demand.items()]
 
 # Cost estimation
-print("\n💰 Cost Estimates (if using all warehouses):")
+lines.append("\n💰 Cost Estimates (if using all warehouses):")
 total_fixed_costs = sum(wh['fixed_cost'] for wh in WAREHOUSE_LOCATIONS.values())
 avg_transport_cost = distance_df['transport_cost_per_shipment'].mean()
 estimated_transport_cost = total_demand * avg_transport_cost
 
-print(f"   Total Fixed Costs: ${total_fixed_costs:,.0f}/year")
-print(f"   Avg Transport Cost: ${avg_transport_cost:.2f}/shipment")
-print(f"   Est. Annual Transport: ${estimated_transport_cost:,.0f}")
-print(f"   Est. Total Cost: ${total_fixed_costs + estimated_transport_cost:,.0f}/year")
+lines += [
+    f"   Total Fixed Costs: ${total_fixed_costs:,.0f}/year",
+    f"   Avg Transport Cost: ${avg_transport_cost:.2f}/shipment",
+    f"   Est. Annual Transport: ${estimated_transport_cost:,.0f}",
+    f"   Est. Total Cost: ${total_fixed_costs + estimated_transport_cost:,.0f}/year",
+]
+print("\n".join(lines))
 
 # Save datasets
 print("\n" + "=" * 70)
@@ -288,21 +409,17 @@ os.makedirs('../data/raw', exist_ok=True)
 os.makedirs('../data/processed', exist_ok=True)
 
 # Save full datasets
-demand_df.to_csv('../data/raw/demand_data_2024.csv', index=False)
-print("✅ Saved: data/raw/demand_data_2024.csv")
+save_frame(demand_df, '../data/raw/demand_data_2024.csv')
+print("✅ Saved: data/raw/demand_data_2024.csv (+ .parquet)")
 
-distance_df.to_csv('../data/raw/distance_matrix.csv', index=False)
-print("✅ Saved: data/raw/distance_matrix.csv")
+save_frame(distance_df, '../data/raw/distance_matrix.csv')
+print("✅ Saved: data/raw/distance_matrix.csv (+ .parquet)")
 
 # Save aggregated demand (for optimization)
-agg_demand = demand_df.groupby(['city', 'lat', 'lon', 'region', 'service_level']).agg({
-    'demand': 'sum',
-    'total_weight_kg': 'sum',
-    'total_value': 'sum'
-}).reset_index()
+agg_demand = demand_cube.groupby(level=LOCATION_KEYS, observed=True).sum().reset_index()
 
-agg_demand.to_csv('../data/processed/aggregated_demand.csv', index=False)
-print("✅ Saved: data/processed/aggregated_demand.csv")
+save_frame(agg_demand, '../data/processed/aggregated_demand.csv', compression='zstd')
+print("✅ Saved: data/processed/aggregated_demand.csv (+ .parquet)")
 
 # Save warehouse info
 warehouse_df = pd.DataFrame([
@@ -315,8 +432,8 @@ warehouse_df = pd.DataFrame([
     }
     for name, info in WAREHOUSE_LOCATIONS.items()
 ])
-warehouse_df.to_csv('../data/processed/warehouse_locations.csv', index=False)
-print("✅ Saved: data/processed/warehouse_locations.csv")
+save_frame(warehouse_df, '../data/processed/warehouse_locations.csv', compression='zstd')
+print("✅ Saved: data/processed/warehouse_locations.csv (+ .parquet)")
 
 # Save summary stats
 summary_stats = {
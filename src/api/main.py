@@ -4,17 +4,20 @@ API for supply chain network optimization queries and analysis
 """
 
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import FileResponse
 from pydantic import BaseModel
 from typing import Optional, List
+from functools import lru_cache
 import sys
+import asyncio
 import os
 import pandas as pd
-import pickle
 
 # Add parent directories to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from optimization.network_optimizer import NetworkOptimizer
+from common.io import read_frame, load_solution
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -30,11 +33,10 @@ demand_df = None
 distance_df = None
 
 try:
-    with open('../../models/network_solution.pkl', 'rb') as f:
-        solution = pickle.load(f)
-    warehouse_df = pd.read_csv('../../data/processed/warehouse_locations.csv')
-    demand_df = pd.read_csv('../../data/processed/aggregated_demand.csv')
-    distance_df = pd.read_csv('../../data/raw/distance_matrix.csv')
+    solution = load_solution('../../models/network_solution')
+    warehouse_df = read_frame('../../data/processed/warehouse_locations.csv')
+    demand_df = read_frame('../../data/processed/aggregated_demand.csv')
+    distance_df = read_frame('../../data/raw/distance_matrix.csv')
     print("Successfully loaded optimization solution and data")
 except Exception as e:
     print(f"Warning: Could not load data - {e}")
@@ -72,6 +74,144 @@ class OptimizationResponse(BaseModel):
     savings_percentage: float
     routes: List[RouteInfo]
 
+# ==========================================
+# CACHED RESPONSES
+# ==========================================
+# The solution and data files are only read at startup, so every payload
+# below is built once and then served as-is until the API restarts.
+
+RESPONSES = {}
+
+def cached(name, build):
+    """Return the payload for `name`, building it on first use"""
+    if name not in RESPONSES:
+        RESPONSES[name] = build()
+    return RESPONSES[name]
+
+def _solution_payload():
+    baseline_cost = 22_667_407  # From data generation
+    savings = baseline_cost - solution['total_cost']
+    savings_pct = (savings / baseline_cost) * 100
+    
+    return {
+        "open_warehouses": solution['open_warehouses'],
+        "num_warehouses": solution['num_warehouses'],
+        "total_cost": solution['total_cost'],
+        "fixed_cost": solution['fixed_cost'],
+        "variable_cost": solution['variable_cost'],
+        "baseline_cost": baseline_cost,
+        "annual_savings": savings,
+        "savings_percentage": round(savings_pct, 2),
+        "num_routes": len(solution['routes'])
+    }
+
+def _warehouses_payload():
+    warehouses = warehouse_df[['warehouse', 'lat', 'lon', 'region', 'fixed_cost_annual']].rename(
+        columns={'warehouse': 'name', 'fixed_cost_annual': 'fixed_cost'}
+    )
+    warehouses['is_open'] = warehouses['name'].isin(set(solution['open_warehouses']))
+    
+    return {"warehouses": warehouses.to_dict(orient='records')}
+
+def _routes_payload():
+    return {"routes": solution['routes'].to_dict(orient='records')}
+
+def _demand_payload():
+    # Regional summary
+    regional = demand_df.groupby('region', observed=True)['demand'].sum().to_dict()
+    
+    # Top cities
+    city_demand = demand_df.groupby('city', observed=True)['demand'].sum().nlargest(10)
+    top_cities = [{"city": city, "demand": int(demand)} for city, demand in city_demand.items()]
+    
+    return {
+        "regional_demand": regional,
+        "top_cities": top_cities,
+        "total_demand": int(demand_df['demand'].sum())
+    }
+
+def _cost_breakdown_payload():
+    baseline_cost = 22_667_407
+    optimized_cost = solution['total_cost']
+    
+    # Per warehouse breakdown (one pass over the routes)
+    route_totals = solution['routes'].groupby('warehouse', sort=False).agg(
+        variable_cost=('total_cost', 'sum'),
+        num_routes=('customer', 'count'),
+        total_shipments=('shipments', 'sum')
+    )
+    breakdown = (
+        warehouse_df.set_index('warehouse')[['fixed_cost_annual']]
+        .rename(columns={'fixed_cost_annual': 'fixed_cost'})
+        .join(route_totals)
+        .loc[solution['open_warehouses']]
+        .fillna(0)
+    )
+    breakdown['total_cost'] = breakdown['fixed_cost'] + breakdown['variable_cost']
+    breakdown['num_routes'] = breakdown['num_routes'].astype(int)
+    warehouse_costs = breakdown.reset_index()[
+        ['warehouse', 'fixed_cost', 'variable_cost', 'total_cost', 'num_routes', 'total_shipments']
+    ].to_dict(orient='records')
+    
+    return {
+        "baseline_cost": baseline_cost,
+        "optimized_cost": optimized_cost,
+        "savings": baseline_cost - optimized_cost,
+        "fixed_cost_total": solution['fixed_cost'],
+        "variable_cost_total": solution['variable_cost'],
+        "warehouse_breakdown": warehouse_costs
+    }
+
+def _metrics_payload():
+    baseline_cost = 22_667_407
+    optimized_cost = solution['total_cost']
+    
+    # Reduce the shipments column once in NumPy and reuse the results
+    shipments = solution['routes']['shipments'].to_numpy(dtype=float)
+    total_shipments = float(shipments.sum())
+    num_routes = int(shipments.size)
+    num_customers = int(demand_df['city'].nunique())
+    
+    return {
+        "cost_metrics": {
+            "baseline_cost": baseline_cost,
+            "optimized_cost": optimized_cost,
+            "annual_savings": baseline_cost - optimized_cost,
+            "savings_percentage": round((baseline_cost - optimized_cost) / baseline_cost * 100, 2),
+            "cost_per_shipment": round(optimized_cost / total_shipments, 2) if total_shipments else 0.0
+        },
+        "network_metrics": {
+            "num_warehouses": solution['num_warehouses'],
+            "num_routes": num_routes,
+            "total_shipments": total_shipments,
+            "avg_shipments_per_route": round(total_shipments / num_routes, 2) if num_routes else 0.0,
+            "num_customers_served": num_customers
+        },
+        "efficiency_metrics": {
+            "utilization_rate": round(num_routes / (solution['num_warehouses'] * num_customers) * 100, 2)
+                                if solution['num_warehouses'] and num_customers else 0.0,
+            "fixed_to_variable_ratio": round(solution['fixed_cost'] / solution['variable_cost'], 2)
+                                       if solution['variable_cost'] else 0.0
+        }
+    }
+
+PAYLOADS = {
+    "solution": _solution_payload,
+    "warehouses": _warehouses_payload,
+    "routes": _routes_payload,
+    "demand": _demand_payload,
+    "cost_breakdown": _cost_breakdown_payload,
+    "metrics": _metrics_payload,
+}
+
+# Warm the cache at startup; anything that fails here is retried on request
+if solution is not None and warehouse_df is not None and demand_df is not None:
+    for name, build in PAYLOADS.items():
+        try:
+            cached(name, build)
+        except Exception as e:
+            print(f"Warning: Could not precompute {name} - {e}")
+
 # ==========================================
 # API ENDPOINTS
 # ==========================================
@@ -93,21 +233,7 @@ def get_solution():
     if not solution:
         raise HTTPException(status_code=500, detail="Solution not loaded")
     
-    baseline_cost = 22_667_407  # From data generation
-    savings = baseline_cost - solution['total_cost']
-    savings_pct = (savings / baseline_cost) * 100
-    
-    return {
-        "open_warehouses": solution['open_warehouses'],
-        "num_warehouses": solution['num_warehouses'],
-        "total_cost": solution['total_cost'],
-        "fixed_cost": solution['fixed_cost'],
-        "variable_cost": solution['variable_cost'],
-        "baseline_cost": baseline_cost,
-        "annual_savings": savings,
-        "savings_percentage": round(savings_pct, 2),
-        "num_routes": len(solution['routes'])
-    }
+    return cached("solution", _solution_payload)
 
 @app.get("/warehouses")
 def get_warehouses():
@@ -117,20 +243,7 @@ def get_warehouses():
     if warehouse_df is None or solution is None:
         raise HTTPException(status_code=500, detail="Data not loaded")
     
-    warehouses = []
-    open_whs = solution['open_warehouses']
-    
-    for _, wh in warehouse_df.iterrows():
-        warehouses.append({
-            "name": wh['warehouse'],
-            "lat": wh['lat'],
-            "lon": wh['lon'],
-            "region": wh['region'],
-            "fixed_cost": wh['fixed_cost_annual'],
-            "is_open": wh['warehouse'] in open_whs
-        })
-    
-    return {"warehouses": warehouses}
+    return cached("warehouses", _warehouses_payload)
 
 @app.get("/routes")
 def get_routes():
@@ -140,8 +253,7 @@ def get_routes():
     if solution is None:
         raise HTTPException(status_code=500, detail="Solution not loaded")
     
-    routes = solution['routes'].to_dict(orient='records')
-    return {"routes": routes}
+    return cached("routes", _routes_payload)
 
 @app.get("/demand")
 def get_demand():
@@ -151,18 +263,7 @@ def get_demand():
     if demand_df is None:
         raise HTTPException(status_code=500, detail="Data not loaded")
     
-    # Regional summary
-    regional = demand_df.groupby('region')['demand'].sum().to_dict()
-    
-    # Top cities
-    city_demand = demand_df.groupby('city')['demand'].sum().sort_values(ascending=False).head(10)
-    top_cities = [{"city": city, "demand": int(demand)} for city, demand in city_demand.items()]
-    
-    return {
-        "regional_demand": regional,
-        "top_cities": top_cities,
-        "total_demand": int(demand_df['demand'].sum())
-    }
+    return cached("demand", _demand_payload)
 
 @app.get("/cost-breakdown")
 def get_cost_breakdown():
@@ -172,32 +273,7 @@ def get_cost_breakdown():
     if solution is None:
         raise HTTPException(status_code=500, detail="Solution not loaded")
     
-    baseline_cost = 22_667_407
-    optimized_cost = solution['total_cost']
-    
-    # Per warehouse breakdown
-    warehouse_costs = []
-    for wh in solution['open_warehouses']:
-        wh_data = warehouse_df[warehouse_df['warehouse'] == wh].iloc[0]
-        wh_routes = solution['routes'][solution['routes']['warehouse'] == wh]
-        
-        warehouse_costs.append({
-            "warehouse": wh,
-            "fixed_cost": wh_data['fixed_cost_annual'],
-            "variable_cost": wh_routes['total_cost'].sum(),
-            "total_cost": wh_data['fixed_cost_annual'] + wh_routes['total_cost'].sum(),
-            "num_routes": len(wh_routes),
-            "total_shipments": wh_routes['shipments'].sum()
-        })
-    
-    return {
-        "baseline_cost": baseline_cost,
-        "optimized_cost": optimized_cost,
-        "savings": baseline_cost - optimized_cost,
-        "fixed_cost_total": solution['fixed_cost'],
-        "variable_cost_total": solution['variable_cost'],
-        "warehouse_breakdown": warehouse_costs
-    }
+    return cached("cost_breakdown", _cost_breakdown_payload)
 
 @app.get("/scenarios")
 def get_scenarios():
@@ -205,7 +281,7 @@ def get_scenarios():
     Get scenario analysis comparing different warehouse counts
     """
     try:
-        scenario_df = pd.read_csv('../../data/processed/scenario_analysis.csv')
+        scenario_df = pd.read_csv('../../data/processed/scenario_analysis.csv', engine='pyarrow')
         scenarios = scenario_df.to_dict(orient='records')
         
         # Find optimal
@@ -222,49 +298,54 @@ def get_scenarios():
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Could not load scenarios: {str(e)}")
 
+@lru_cache(maxsize=64)
+def _solve(max_warehouses, service_level):
+    """
+    Build and solve one optimization request. The input data is fixed for
+    the life of the process, so results are cached per parameter pair.
+    """
+    optimizer = NetworkOptimizer()
+    optimizer.load_data()
+    optimizer.build_model(
+        max_warehouses=max_warehouses,
+        service_level_filter=service_level
+    )
+    optimizer.solve(time_limit=60)
+    
+    if not optimizer.solution:
+        raise HTTPException(status_code=500, detail="Optimization failed")
+    
+    baseline_cost = 22_667_407
+    savings = baseline_cost - optimizer.solution['total_cost']
+    savings_pct = (savings / baseline_cost) * 100
+    
+    routes = optimizer.solution['routes'][
+        ['warehouse', 'customer', 'shipments', 'cost_per_shipment', 'total_cost']
+    ].to_dict(orient='records')
+    
+    return {
+        "open_warehouses": optimizer.solution['open_warehouses'],
+        "num_warehouses": optimizer.solution['num_warehouses'],
+        "total_cost": optimizer.solution['total_cost'],
+        "fixed_cost": optimizer.solution['fixed_cost'],
+        "variable_cost": optimizer.solution['variable_cost'],
+        "annual_savings": savings,
+        "savings_percentage": round(savings_pct, 2),
+        "routes": routes
+    }
+
 @app.post("/optimize")
 def run_optimization(request: OptimizationRequest):
     """
     Run optimization with custom parameters
     """
     try:
-        optimizer = NetworkOptimizer()
-        optimizer.load_data()
-        optimizer.build_model(
-            max_warehouses=request.max_warehouses,
-            service_level_filter=request.service_level
-        )
-        optimizer.solve(time_limit=60)
-        
-        if not optimizer.solution:
-            raise HTTPException(status_code=500, detail="Optimization failed")
-        
-        baseline_cost = 22_667_407
-        savings = baseline_cost - optimizer.solution['total_cost']
-        savings_pct = (savings / baseline_cost) * 100
-        
-        routes = [
-            {
-                "warehouse": r['warehouse'],
-                "customer": r['customer'],
-                "shipments": r['shipments'],
-                "cost_per_shipment": r['cost_per_shipment'],
-                "total_cost": r['total_cost']
-            }
-            for _, r in optimizer.solution['routes'].iterrows()
-        ]
-        
-        return {
-            "open_warehouses": optimizer.solution['open_warehouses'],
-            "num_warehouses": optimizer.solution['num_warehouses'],
-            "total_cost": optimizer.solution['total_cost'],
-            "fixed_cost": optimizer.solution['fixed_cost'],
-            "variable_cost": optimizer.solution['variable_cost'],
-            "annual_savings": savings,
-            "savings_percentage": round(savings_pct, 2),
-            "routes": routes
-        }
+        # Copy so a caller can't mutate the cached result
+        return dict(_solve(request.max_warehouses, request.service_level))
     
+    except ValueError as e:
+        # Bad request parameters, e.g. an unknown service level
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -276,31 +357,36 @@ def get_metrics():
     if solution is None or demand_df is None:
         raise HTTPException(status_code=500, detail="Data not loaded")
     
-    baseline_cost = 22_667_407
-    optimized_cost = solution['total_cost']
-    
-    routes_df = solution['routes']
+    return cached("metrics", _metrics_payload)
+
+@app.get("/map")
+def get_map():
+    """
+    Generated network map, served as HTML for the dashboard's iframe
+    """
+    map_file = '../../dashboards/static/network_map.html'
+    if not os.path.exists(map_file):
+        raise HTTPException(status_code=404, detail="Map not generated")
     
-    return {
-        "cost_metrics": {
-            "baseline_cost": baseline_cost,
-            "optimized_cost": optimized_cost,
-            "annual_savings": baseline_cost - optimized_cost,
-            "savings_percentage": round((baseline_cost - optimized_cost) / baseline_cost * 100, 2),
-            "cost_per_shipment": round(optimized_cost / routes_df['shipments'].sum(), 2)
-        },
-        "network_metrics": {
-            "num_warehouses": solution['num_warehouses'],
-            "num_routes": len(routes_df),
-            "total_shipments": routes_df['shipments'].sum(),
-            "avg_shipments_per_route": round(routes_df['shipments'].mean(), 2),
-            "num_customers_served": demand_df['city'].nunique()
-        },
-        "efficiency_metrics": {
-            "utilization_rate": round(len(routes_df) / (solution['num_warehouses'] * demand_df['city'].nunique()) * 100, 2),
-            "fixed_to_variable_ratio": round(solution['fixed_cost'] / solution['variable_cost'], 2)
-        }
+    return FileResponse(map_file, media_type="text/html")
+
+@app.get("/dashboard-bundle")
+async def get_dashboard_bundle():
+    """
+    Solution, warehouses, cost breakdown, metrics, demand and scenarios in
+    one payload, so the dashboard needs a single round-trip. Sections are
+    built concurrently; any failure fails the whole bundle.
+    """
+    sections = {
+        "solution": get_solution,
+        "warehouses": get_warehouses,
+        "cost_breakdown": get_cost_breakdown,
+        "metrics": get_metrics,
+        "demand": get_demand,
+        "scenarios": get_scenarios,
     }
+    results = await asyncio.gather(*(asyncio.to_thread(fn) for fn in sections.values()))
+    return dict(zip(sections, results))
 
 # ==========================================
 # RUN SERVER
@@ -0,0 +1,33 @@
+"""
+LogiFlow - Shared I/O
+Readers for the generated data tables and saved solutions, kept free of
+solver and plotting imports so every component can load them cheaply
+"""
+
+import pandas as pd
+import json
+import os
+
+def read_frame(path, columns=None):
+    """
+    Load a table written by the data generator, preferring its Parquet copy
+    (typed, compressed, fast to load) and falling back to the CSV when the
+    copy is missing or older than the CSV (e.g. after the CSV was edited)
+    """
+    stem = os.path.splitext(path)[0]
+    csv_path, parquet_path = stem + '.csv', stem + '.parquet'
+    if os.path.exists(parquet_path) and (
+            not os.path.exists(csv_path)
+            or os.path.getmtime(parquet_path) >= os.path.getmtime(csv_path)):
+        return pd.read_parquet(parquet_path, columns=columns)
+    return pd.read_csv(csv_path, engine='pyarrow', usecols=columns)
+
+def load_solution(filepath='../../models/network_solution'):
+    """
+    Load a solution written by NetworkOptimizer.save_solution: scalars and
+    open warehouses from the JSON summary, routes from the Parquet table
+    """
+    with open(f"{filepath}_summary.json") as f:
+        solution = json.load(f)
+    solution['routes'] = pd.read_parquet(f"{filepath}_routes.parquet")
+    return solution
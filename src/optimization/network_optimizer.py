@@ -6,8 +6,36 @@ Uses Linear Programming to find optimal warehouse locations and routing
 import pandas as pd
 import numpy as np
 from pulp import *
-import pickle
+from scipy import sparse
+from scipy.optimize import milp, LinearConstraint, Bounds
+import json
+import sys
 import os
+from concurrent.futures import ProcessPoolExecutor
+
+# Add parent directories to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common.io import read_frame
+
+def _solve_scenario(max_warehouses, data_files, time_limit=60):
+    """
+    Solve one warehouse-count scenario in a fresh optimizer (runs in a
+    worker process) and return its cost summary, or None if unsolved
+    """
+    optimizer = NetworkOptimizer()
+    optimizer.load_data(*data_files)
+    optimizer.build_model(max_warehouses=max_warehouses)
+    if not optimizer.solve(time_limit=time_limit):
+        return None
+    
+    return {
+        'max_warehouses': max_warehouses,
+        'actual_warehouses': optimizer.solution['num_warehouses'],
+        'total_cost': optimizer.solution['total_cost'],
+        'fixed_cost': optimizer.solution['fixed_cost'],
+        'variable_cost': optimizer.solution['variable_cost']
+    }
 
 class NetworkOptimizer:
     """
@@ -29,28 +57,36 @@ class NetworkOptimizer:
         Load network data
         """
         print("📊 Loading network data...")
+        self.data_files = (warehouse_file, demand_file, distance_file)
         
         # Load warehouse info
-        self.warehouse_df = pd.read_csv(warehouse_file)
+        self.warehouse_df = read_frame(warehouse_file)
         self.warehouses = self.warehouse_df['warehouse'].tolist()
         print(f"✅ Loaded {len(self.warehouses)} potential warehouses")
         
         # Load demand data
-        self.demand_df = pd.read_csv(demand_file)
+        self.demand_df = read_frame(demand_file)
         self.customers = self.demand_df['city'].unique().tolist()
         print(f"✅ Loaded {len(self.customers)} customer cities")
         
         # Load distance matrix
-        self.distance_df = pd.read_csv(distance_file)
+        self.distance_df = read_frame(distance_file)
         print(f"✅ Loaded distance matrix with {len(self.distance_df):,} routes")
         
     def build_model(self, max_warehouses=None, service_level_filter='Standard'):
+        """
+        Build the base model and apply an optional warehouse limit
+        """
+        self.build_base_model(service_level_filter)
+        self.set_max_warehouses(max_warehouses)
+        
+    def build_base_model(self, service_level_filter='Standard'):
         """
         Build linear programming optimization model
         
         Decision Variables:
         - y[w] = 1 if warehouse w is open, 0 otherwise (binary)
-        - x[w,c] = flow from warehouse w to customer c (continuous)
+        - x[r] = flow along route r, i.e. from warehouse w to customer c (continuous)
         
         Objective:
         Minimize: Sum of (Fixed Costs) + Sum of (Variable Transport Costs)
@@ -58,7 +94,9 @@ class NetworkOptimizer:
         Constraints:
         1. Demand satisfaction: Each customer gets all demand met
         2. Capacity: Can't ship from closed warehouses
-        3. Maximum warehouses: Optional limit on number of open warehouses
+        
+        The optional maximum-warehouses limit is added separately by
+        set_max_warehouses(), so scenarios can reuse this model.
         """
         
         print("\n🔧 Building optimization model...")
@@ -67,94 +105,135 @@ class NetworkOptimizer:
         # Filter data for specific service level
         demand_filtered = self.demand_df[self.demand_df['service_level'] == service_level_filter].copy()
         distance_filtered = self.distance_df[self.distance_df['service_level'] == service_level_filter].copy()
-        
-        # Create demand dictionary: {customer: total_demand}
-        demand_dict = demand_filtered.groupby('city')['demand'].sum().to_dict()
-        
-        # Create cost dictionary: {(warehouse, customer): cost_per_unit}
-        cost_dict = {}
-        for _, row in distance_filtered.iterrows():
-            cost_dict[(row['warehouse'], row['customer_city'])] = row['transport_cost_per_shipment']
-        
-        # Create fixed cost dictionary: {warehouse: annual_fixed_cost}
-        fixed_cost_dict = dict(zip(self.warehouse_df['warehouse'], 
-                                   self.warehouse_df['fixed_cost_annual']))
+        if demand_filtered.empty or distance_filtered.empty:
+            raise ValueError(f"No demand or route data for service level '{service_level_filter}'")
+        
+        # Factorize names into integer ids once: the model is indexed by
+        # warehouse id (position in self.warehouses), customer id (position in
+        # self.customer_names) and route id; names only reappear in the output
+        demand = demand_filtered.groupby('city', observed=True)['demand'].sum()
+        self.customer_names = demand.index.tolist()
+        demand_arr = demand.to_numpy(dtype=float)
+        fixed_costs = (self.warehouse_df.set_index('warehouse')['fixed_cost_annual']
+                       .reindex(self.warehouses).to_numpy(dtype=float))
+        
+        # Routes: only (w, c) pairs that have a distance record at this service level
+        route_w = pd.Categorical(distance_filtered['warehouse'], categories=self.warehouses).codes
+        route_c = pd.Categorical(distance_filtered['customer_city'], categories=self.customer_names).codes
+        valid = (route_w >= 0) & (route_c >= 0)
+        route_w = route_w[valid].astype(np.int64)
+        route_c = route_c[valid].astype(np.int64)
+        route_costs = distance_filtered['transport_cost_per_shipment'].to_numpy(dtype=float)[valid]
+        n_wh, n_cust, n_routes = len(self.warehouses), len(self.customer_names), len(route_w)
+        
+        # Route ids grouped by customer and by warehouse, for the constraints
+        by_cust = np.argsort(route_c, kind='stable')
+        routes_of_cust = np.split(by_cust, np.cumsum(np.bincount(route_c, minlength=n_cust))[:-1])
+        by_wh = np.argsort(route_w, kind='stable')
+        routes_of_wh = np.split(by_wh, np.cumsum(np.bincount(route_w, minlength=n_wh))[:-1])
         
         # Initialize LP model
         self.model = LpProblem("Supply_Chain_Network_Optimization", LpMinimize)
         
         # Decision Variables
-        # y[w] = 1 if warehouse w is open
+        # y[i] = 1 if warehouse i is open
         y = LpVariable.dicts("warehouse_open", 
-                             self.warehouses, 
+                             range(n_wh), 
                              cat='Binary')
         
-        # x[(w,c)] = units shipped from warehouse w to customer c
-        routes = [(w, c) for w in self.warehouses for c in demand_dict.keys()]
+        # x[r] = units shipped along route r (warehouse route_w[r] -> customer route_c[r])
         x = LpVariable.dicts("shipment", 
-                             routes, 
+                             range(n_routes), 
                              lowBound=0, 
                              cat='Continuous')
         
         # Objective Function: Minimize Total Cost
         # Total Cost = Fixed Costs + Variable Transport Costs
-        self.model += (
-            lpSum([fixed_cost_dict[w] * y[w] for w in self.warehouses]) +  # Fixed costs
-            lpSum([cost_dict.get((w, c), 0) * x[(w, c)] for (w, c) in routes])  # Transport costs
+        # (coefficients are aligned to the variable order up front and fed to
+        # LpAffineExpression directly, skipping lpSum's term-by-term products)
+        # Zero cost is legitimate (warehouse in the customer's city); NaN or
+        # negative costs point at bad distance data
+        bad_routes = int((np.isnan(route_costs) | (route_costs < 0)).sum())
+        if bad_routes:
+            print(f"   ⚠️  Warning: {bad_routes} routes have a missing or negative transport cost")
+        self.model += LpAffineExpression(
+            list(zip(y.values(), fixed_costs.tolist())) +  # Fixed costs
+            list(zip(x.values(), route_costs.tolist()))  # Transport costs
         ), "Total_Cost"
         
         # Constraint 1: Meet all customer demand
-        for c in demand_dict.keys():
+        for ci, c in enumerate(self.customer_names):
             self.model += (
-                lpSum([x[(w, c)] for w in self.warehouses]) == demand_dict[c],
+                lpSum([x[r] for r in routes_of_cust[ci].tolist()]) == demand_arr[ci],
                 f"Demand_{c}"
             )
         
         # Constraint 2: Can only ship from open warehouses
-        # (Big M constraint)
-        M = sum(demand_dict.values())  # Big number (total demand)
-        for w in self.warehouses:
-            for c in demand_dict.keys():
-                self.model += (
-                    x[(w, c)] <= M * y[w],
-                    f"Capacity_{w}_{c}"
-                )
-        
-        # Constraint 3: Maximum number of warehouses (optional)
-        if max_warehouses:
+        # (one aggregated linking constraint per warehouse: total outflow
+        # is bounded by total demand when open, zero when closed)
+        total_demand = demand_arr.sum()
+        for wi, w in enumerate(self.warehouses):
             self.model += (
-                lpSum([y[w] for w in self.warehouses]) <= max_warehouses,
-                "Max_Warehouses"
+                lpSum([x[r] for r in routes_of_wh[wi].tolist()]) <= total_demand * y[wi],
+                f"Capacity_{w}"
             )
         
         # Store variables for later access
         self.y = y
         self.x = x
-        self.demand_dict = demand_dict
-        self.cost_dict = cost_dict
-        self.fixed_cost_dict = fixed_cost_dict
+        self.route_w = route_w
+        self.route_c = route_c
+        self.route_costs = route_costs
+        self.demand_arr = demand_arr
+        self.fixed_costs = fixed_costs
+        self.max_warehouses = None
         
         print(f"✅ Model built successfully!")
         print(f"   Decision variables: {len(y)} warehouse decisions + {len(x)} routing decisions")
         print(f"   Constraints: {len(self.model.constraints)}")
         
-    def solve(self, time_limit=300):
+    def set_max_warehouses(self, max_warehouses=None):
+        """
+        Replace the maximum-warehouses constraint on the built model
+        (None removes it)
+        """
+        self.model.constraints.pop("Max_Warehouses", None)
+        self.max_warehouses = max_warehouses
+        if max_warehouses:
+            self.model += (
+                lpSum(self.y.values()) <= max_warehouses,
+                "Max_Warehouses"
+            )
+        
+    def solve(self, time_limit=300, warm_start=False, backend='pulp'):
         """
         Solve the optimization model
         
         Args:
             time_limit: Maximum solving time in seconds
+            warm_start: Seed the solver with the current variable values
+                        (e.g. the previous scenario's solution)
+            backend: 'pulp' to solve through PuLP's solver interface, or
+                     'scipy' to hand sparse matrices to scipy.optimize.milp
         """
         print("\n🚀 Solving optimization model...")
         print("   (This may take 30-60 seconds for large networks)")
         print("=" * 70)
         
-        # Solve using PULP_CBC_CMD (default solver)
-        solver = PULP_CBC_CMD(timeLimit=time_limit, msg=1)
-        self.model.solve(solver)
+        if backend == 'scipy':
+            status = self._solve_sparse(time_limit)
+        else:
+            # Solve using HiGHS when its binary is installed (faster presolve and
+            # branch-and-cut on this model), otherwise PuLP's bundled CBC
+            # (HiGHS_CMD only accepts warmStart from pulp 2.8, so it is CBC-only)
+            solver = HiGHS_CMD(timeLimit=time_limit, msg=True)
+            if not solver.available():
+                solver = PULP_CBC_CMD(timeLimit=time_limit, msg=1, warmStart=warm_start)
+            print(f"   Solver: {solver.name}")
+            self.model.solve(solver)
+            status = LpStatus[self.model.status]
         
         # Check solution status
-        status = LpStatus[self.model.status]
         print(f"\n✅ Optimization Status: {status}")
         
         if status == 'Optimal':
@@ -170,30 +249,90 @@ class NetworkOptimizer:
         
         return self.solution
     
+    def _solve_sparse(self, time_limit):
+        """
+        Solve the built model with scipy.optimize.milp (HiGHS), assembling
+        the constraint matrices directly instead of writing an MPS file.
+        The solution is written back to the PuLP variables so
+        extract_solution() works unchanged. Returns a PuLP status string.
+        
+        Variable layout: [y_0 .. y_{W-1}, x_0 .. x_{R-1}] (warehouse ids, route ids)
+        """
+        n_wh = len(self.warehouses)
+        n_routes = len(self.route_w)
+        route_wh, route_cust = self.route_w, self.route_c
+        x_cols = n_wh + np.arange(n_routes)
+        demand = self.demand_arr
+        
+        c_vec = np.concatenate([self.fixed_costs, self.route_costs])
+        
+        # Demand: sum_w x[w,c] == demand[c]
+        A_demand = sparse.csr_matrix(
+            (np.ones(n_routes), (route_cust, x_cols)), shape=(len(demand), n_wh + n_routes)
+        )
+        constraints = [LinearConstraint(A_demand, demand, demand)]
+        
+        # Linking: sum_c x[w,c] - total_demand * y[w] <= 0
+        A_link = sparse.csr_matrix(
+            (np.concatenate([np.ones(n_routes), np.full(n_wh, -demand.sum())]),
+             (np.concatenate([route_wh, np.arange(n_wh)]), np.concatenate([x_cols, np.arange(n_wh)]))),
+            shape=(n_wh, n_wh + n_routes)
+        )
+        constraints.append(LinearConstraint(A_link, -np.inf, 0))
+        
+        # Maximum warehouses: sum_w y[w] <= max_warehouses
+        if self.max_warehouses:
+            A_max = sparse.csr_matrix(
+                (np.ones(n_wh), (np.zeros(n_wh, dtype=np.int64), np.arange(n_wh))),
+                shape=(1, n_wh + n_routes)
+            )
+            constraints.append(LinearConstraint(A_max, -np.inf, self.max_warehouses))
+        
+        print("   Solver: scipy.optimize.milp (HiGHS)")
+        result = milp(
+            c=c_vec,
+            constraints=constraints,
+            integrality=np.concatenate([np.ones(n_wh), np.zeros(n_routes)]),
+            bounds=Bounds(0, np.concatenate([np.ones(n_wh), np.full(n_routes, np.inf)])),
+            options={'time_limit': time_limit, 'disp': True}
+        )
+        
+        if result.x is None:
+            return {2: 'Infeasible', 3: 'Unbounded'}.get(result.status, 'Not Solved')
+        
+        for var, v in zip(self.y.values(), result.x[:n_wh].tolist()):
+            var.varValue = v
+        for var, v in zip(self.x.values(), result.x[n_wh:].tolist()):
+            var.varValue = v
+        
+        return 'Optimal' if result.status == 0 else 'Feasible'
+    
     def extract_solution(self):
         """
         Extract and format the solution
         """
         # Find open warehouses
-        open_warehouses = [w for w in self.warehouses if self.y[w].varValue > 0.5]
-        
-        # Extract routing decisions
-        routes = []
-        for (w, c) in self.x:
-            flow = self.x[(w, c)].varValue
-            if flow > 0.01:  # Only include significant flows
-                routes.append({
-                    'warehouse': w,
-                    'customer': c,
-                    'shipments': round(flow, 2),
-                    'cost_per_shipment': self.cost_dict.get((w, c), 0),
-                    'total_cost': round(flow * self.cost_dict.get((w, c), 0), 2)
-                })
-        
-        routes_df = pd.DataFrame(routes)
+        is_open = np.fromiter((v.varValue or 0.0 for v in self.y.values()),
+                              dtype=np.float64, count=len(self.y)) > 0.5
+        open_warehouses = [w for w, o in zip(self.warehouses, is_open) if o]
+        
+        # Extract routing decisions (flows pulled into one array indexed by route id)
+        flows = np.fromiter((v.varValue or 0.0 for v in self.x.values()),
+                            dtype=np.float64, count=len(self.x))
+        used = np.flatnonzero(flows > 0.01)  # Only include significant flows
+        flows = flows[used]
+        costs = self.route_costs[used]
+        
+        routes_df = pd.DataFrame({
+            'warehouse': np.asarray(self.warehouses, dtype=object)[self.route_w[used]],
+            'customer': np.asarray(self.customer_names, dtype=object)[self.route_c[used]],
+            'shipments': flows.round(2),
+            'cost_per_shipment': costs,
+            'total_cost': (flows * costs).round(2)
+        })
         
         # Calculate costs
-        total_fixed_cost = sum(self.fixed_cost_dict[w] for w in open_warehouses)
+        total_fixed_cost = float(self.fixed_costs[is_open].sum())
         total_variable_cost = routes_df['total_cost'].sum()
         total_cost = total_fixed_cost + total_variable_cost
         
@@ -225,29 +364,27 @@ class NetworkOptimizer:
         print(f"   Total Routes: {len(routes_df)}")
         print(f"   Total Shipments: {routes_df['shipments'].sum():,.0f}")
         
-    def compare_scenarios(self):
+    def compare_scenarios(self, warehouse_counts=(2, 3, 4, 5, 6, 7, 8), max_workers=None):
         """
         Compare different warehouse count scenarios
+        
+        Args:
+            warehouse_counts: Maximum-warehouse limits to test
+            max_workers: Worker processes for solving scenarios in parallel
+                         (None = one per CPU, 1 = sequential with warm starts)
         """
         print("\n🔄 Running scenario analysis...")
         print("=" * 70)
         
-        scenarios = []
-        
-        # Test different numbers of warehouses
-        for n in [2, 3, 4, 5, 6, 7, 8]:
-            print(f"\nScenario: Maximum {n} warehouses")
-            self.build_model(max_warehouses=n)
-            self.solve(time_limit=60)
-            
-            if self.solution:
-                scenarios.append({
-                    'max_warehouses': n,
-                    'actual_warehouses': self.solution['num_warehouses'],
-                    'total_cost': self.solution['total_cost'],
-                    'fixed_cost': self.solution['fixed_cost'],
-                    'variable_cost': self.solution['variable_cost']
-                })
+        if max_workers == 1:
+            scenarios = self._compare_scenarios_sequential(warehouse_counts)
+        else:
+            # Scenarios are independent and CBC is single-threaded, so each one
+            # gets its own process
+            workers = max_workers or min(len(warehouse_counts), os.cpu_count())
+            with ProcessPoolExecutor(max_workers=workers) as ex:
+                futures = [ex.submit(_solve_scenario, n, self.data_files) for n in warehouse_counts]
+                scenarios = [r for r in (f.result() for f in futures) if r]
         
         scenario_df = pd.DataFrame(scenarios)
         
@@ -266,6 +403,33 @@ class NetworkOptimizer:
         
         return scenario_df
     
+    def _compare_scenarios_sequential(self, warehouse_counts):
+        """
+        Solve scenarios one after another on a single reused model
+        """
+        scenarios = []
+        
+        # Build once; only the warehouse limit changes between scenarios.
+        # Limits increase, so each solution is a feasible warm start for the next.
+        self.build_base_model()
+        
+        # Test different numbers of warehouses
+        for n in warehouse_counts:
+            print(f"\nScenario: Maximum {n} warehouses")
+            self.set_max_warehouses(n)
+            self.solve(time_limit=60, warm_start=self.solution is not None)
+            
+            if self.solution:
+                scenarios.append({
+                    'max_warehouses': n,
+                    'actual_warehouses': self.solution['num_warehouses'],
+                    'total_cost': self.solution['total_cost'],
+                    'fixed_cost': self.solution['fixed_cost'],
+                    'variable_cost': self.solution['variable_cost']
+                })
+        
+        return scenarios
+    
     def calculate_savings(self, baseline_cost):
         """
         Calculate savings vs baseline
@@ -292,14 +456,17 @@ class NetworkOptimizer:
             'savings_percentage': savings_pct
         }
     
-    def save_solution(self, filepath='../../models/network_solution.pkl'):
+    def save_solution(self, filepath='../../models/network_solution'):
         """
-        Save solution to disk
+        Save solution to disk as <filepath>_summary.json (scalars, open
+        warehouses) and <filepath>_routes.parquet (routing table)
         """
         os.makedirs(os.path.dirname(filepath), exist_ok=True)
-        with open(filepath, 'wb') as f:
-            pickle.dump(self.solution, f)
-        print(f"\n✅ Solution saved to: {filepath}")
+        summary = {k: v for k, v in self.solution.items() if k != 'routes'}
+        with open(f"{filepath}_summary.json", 'w') as f:
+            json.dump(summary, f, indent=2, default=float)
+        self.solution['routes'].to_parquet(f"{filepath}_routes.parquet", index=False)
+        print(f"\n✅ Solution saved to: {filepath}_summary.json + _routes.parquet")
 
 
 # ==========================================
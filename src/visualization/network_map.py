@@ -4,24 +4,58 @@ Create interactive maps showing warehouse locations and routes
 """
 
 import pandas as pd
-import folium
-from folium import plugins
-import pickle
+import numpy as np
 import json
+import sys
+import os
+
+# Add parent directories to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common.io import read_frame
+
+def point(lon, lat):
+    """GeoJSON Point geometry"""
+    return {"type": "Point", "coordinates": [float(lon), float(lat)]}
+
+def segment(lon1, lat1, lon2, lat2):
+    """Two-point line as GeoJSON coordinates"""
+    return [[float(lon1), float(lat1)], [float(lon2), float(lat2)]]
+
+def multi_line(segments):
+    """GeoJSON MultiLineString geometry from a list of segments"""
+    return {"type": "MultiLineString", "coordinates": list(segments)}
+
+def feature(geometry, **properties):
+    """GeoJSON Feature with the given properties"""
+    return {"type": "Feature", "geometry": geometry, "properties": properties}
+
+def feature_collection(features):
+    """GeoJSON FeatureCollection"""
+    return {"type": "FeatureCollection", "features": features}
 
 class NetworkVisualizer:
     """
     Visualize supply chain network on interactive maps
     """
     
+    # Fixed attribute set: no per-instance __dict__; the routes table and
+    # distance matrix sit behind lazily-loading properties
+    __slots__ = ('solution', 'solution_file', '_routes_df', 'warehouse_df', 'demand_df',
+                 '_customer_df', 'distance_file', '_distance_df')
+    
     def __init__(self):
         self.solution = None
+        self.solution_file = None
+        self._routes_df = None
         self.warehouse_df = None
         self.demand_df = None
-        self.distance_df = None
+        self._customer_df = None
+        self.distance_file = None
+        self._distance_df = None
         
     def load_data(self,
-                  solution_file='../../models/network_solution.pkl',
+                  solution_file='../../models/network_solution',
                   warehouse_file='../../data/processed/warehouse_locations.csv',
                   demand_file='../../data/processed/aggregated_demand.csv',
                   distance_file='../../data/raw/distance_matrix.csv'):
@@ -30,110 +64,209 @@ class NetworkVisualizer:
         """
         print("📊 Loading data for visualization...")
         
-        # Load solution
-        with open(solution_file, 'rb') as f:
-            self.solution = pickle.load(f)
+        # Load solution summary (scalars, open warehouses); the routes table
+        # is read from Parquet on first use of routes_df
+        with open(f"{solution_file}_summary.json") as f:
+            self.solution = json.load(f)
+        self.solution_file = solution_file
+        self._routes_df = None
         print(f"✅ Loaded optimization solution")
         
-        # Load data
-        self.warehouse_df = pd.read_csv(warehouse_file)
-        self.demand_df = pd.read_csv(demand_file)
-        self.distance_df = pd.read_csv(distance_file)
+        # Load only the columns the map uses; the distance matrix isn't
+        # needed for the map, so it is read on first access
+        self.warehouse_df = read_frame(warehouse_file,
+                                       columns=['warehouse', 'region', 'fixed_cost_annual', 'lat', 'lon'])
+        self.demand_df = read_frame(demand_file, columns=['city', 'lat', 'lon', 'demand'])
+        self._customer_df = None
+        self.distance_file = distance_file
+        self._distance_df = None
+        
+        # ~1 m precision is plenty for a map; shorter numbers keep the HTML small
+        for df in (self.warehouse_df, self.demand_df):
+            df[['lat', 'lon']] = df[['lat', 'lon']].round(5)
         print(f"✅ Loaded network data")
         
-    def create_network_map(self, output_file='../../dashboards/network_map.html'):
+    @property
+    def routes_df(self):
+        """
+        Solution routing table, loaded on first access
+        """
+        if self._routes_df is None and self.solution_file:
+            self._routes_df = pd.read_parquet(f"{self.solution_file}_routes.parquet")
+        return self._routes_df
+        
+    @property
+    def distance_df(self):
+        """
+        Distance matrix, loaded on first access
+        """
+        if self._distance_df is None and self.distance_file:
+            self._distance_df = read_frame(self.distance_file)
+        return self._distance_df
+        
+    def _customer_locations(self):
+        """
+        One row (city, lat, lon) per customer city, computed once and reused
+        """
+        if self._customer_df is None:
+            self._customer_df = self.demand_df.groupby('city', sort=False, as_index=False, observed=True).agg(
+                lat=('lat', 'first'),
+                lon=('lon', 'first')
+            )
+        return self._customer_df
+    
+    def _build_warehouse_features(self):
+        """
+        GeoJSON features for every potential warehouse, keyed by open status
+        """
+        # Popup HTML is assembled column-wise for all warehouses at once
+        wh = self.warehouse_df
+        is_open = wh['warehouse'].isin(set(self.solution['open_warehouses']))
+        fixed_cost = wh['fixed_cost_annual'].map('${:,.0f}/year'.format)
+        details = "<b>" + wh['warehouse'].astype(str) + "</b><br>Region: " + wh['region'].astype(str) + "<br>"
+        popups = np.where(
+            is_open,
+            "<b>✅ OPEN WAREHOUSE</b><br>" + details + "Fixed Cost: " + fixed_cost,
+            "<b>❌ CLOSED</b><br>" + details + "Cost: " + fixed_cost
+        )
+        
+        warehouse_features = {True: [], False: []}
+        for name, lat, lon, open_, popup_text in zip(wh['warehouse'], wh['lat'], wh['lon'],
+                                                     is_open, popups):
+            warehouse_features[open_].append(
+                feature(point(lon, lat), name=name, popup=popup_text)
+            )
+        return warehouse_features
+    
+    def _build_customer_points(self):
+        """
+        [lat, lon, popup, name] rows for the customer marker cluster
+        """
+        customer_locations = self._customer_locations()
+        demand_by_city = self.demand_df.groupby('city', sort=False, observed=True)['demand'].sum().to_dict()
+        
+        cities = customer_locations['city'].astype(str)
+        total_demand = cities.map(demand_by_city)
+        popups = ("<b>📍 Customer City</b><br><b>" + cities
+                  + "</b><br>Annual Demand: " + total_demand.map('{:,.0f}'.format) + " orders")
+        return [
+            [float(lat), float(lon), popup_text, city]
+            for lat, lon, popup_text, city in zip(customer_locations['lat'], customer_locations['lon'],
+                                                  popups, cities)
+        ]
+    
+    def _build_route_features(self, min_shipment_pct):
+        """
+        GeoJSON line features for the routes at or above the shipment quantile:
+        one MultiLineString per (warehouse, line width) so Leaflet draws a
+        handful of paths per warehouse instead of one layer per route
+        """
+        # One line per (warehouse, customer) pair, so duplicate rows aren't drawn twice
+        routes_df = self.routes_df.groupby(['warehouse', 'customer'], sort=False, as_index=False,
+                                           observed=True)['shipments'].sum()
+        if min_shipment_pct:
+            min_shipments = routes_df['shipments'].quantile(min_shipment_pct)
+            routes_df = routes_df[routes_df['shipments'] >= min_shipments]
+        
+        # Coordinate lookups built once instead of filtering per route
+        customer_locations = self._customer_locations()
+        wh_coords = dict(zip(self.warehouse_df['warehouse'],
+                             zip(self.warehouse_df['lat'], self.warehouse_df['lon'])))
+        cust_coords = dict(zip(customer_locations['city'],
+                               zip(customer_locations['lat'], customer_locations['lon'])))
+        
+        # Line thickness based on shipment volume, rounded up to 0.5 px steps
+        # so routes of similar volume share one feature
+        volumes = routes_df['shipments'].to_numpy(dtype=np.float64)
+        weights = np.minimum(volumes / 5000, 5)  # Scale for visibility
+        weights = np.maximum(np.ceil(weights * 2) / 2, 0.5)
+        
+        lines = pd.DataFrame({
+            'warehouse': routes_df['warehouse'].to_numpy(),
+            'weight': weights,
+            'shipments': volumes,
+            'segment': [
+                segment(*wh_coords[w][::-1], *cust_coords[c][::-1])
+                for w, c in zip(routes_df['warehouse'], routes_df['customer'])
+            ]
+        })
+        
+        route_features = []
+        for (wh_name, weight), group in lines.groupby(['warehouse', 'weight'], sort=False):
+            shipments = group['shipments'].sum()
+            route_features.append(feature(
+                multi_line(group['segment']),
+                weight=float(weight),
+                popup=f"{wh_name} → {len(group)} customers<br>Shipments: {shipments:,.0f}",
+                tooltip=f"{shipments:,.0f} shipments"
+            ))
+        return route_features
+    
+    def create_network_map(self, output_file='../../dashboards/static/network_map.html',
+                           min_shipment_pct=0.1):
         """
         Create interactive map showing warehouses and routes
+        
+        Args:
+            output_file: Where to write the HTML map
+            min_shipment_pct: Skip drawing routes below this shipment-volume
+                              quantile (they render as hairlines anyway);
+                              0 draws every route
         """
         print("\n🗺️  Creating interactive network map...")
         
+        # Imported here so summary-only use doesn't pay folium's import cost
+        import folium
+        from folium import plugins
+        
         # Create base map centered on US
         m = folium.Map(
             location=[39.8283, -98.5795],  # Center of US
             zoom_start=4,
-            tiles='OpenStreetMap'
+            tiles='OpenStreetMap',
+            prefer_canvas=True  # Draw vector layers on one <canvas> instead of SVG nodes
         )
         
-        # Get open warehouses
-        open_warehouses = self.solution['open_warehouses']
+        # Each marker/line type is one GeoJSON layer: a single JSON blob that
+        # Leaflet renders in one loop, instead of a templated object per feature
+        warehouse_features = self._build_warehouse_features()
+        customer_points = self._build_customer_points()
+        route_features = self._build_route_features(min_shipment_pct)
         
         # Add all potential warehouse locations (grayed out if not selected)
-        for _, wh in self.warehouse_df.iterrows():
-            is_open = wh['warehouse'] in open_warehouses
-            
-            if is_open:
-                color = 'green'
-                icon = 'warehouse'
-                prefix = 'fa'
-                popup_text = f"""
-                <b>✅ OPEN WAREHOUSE</b><br>
-                <b>{wh['warehouse']}</b><br>
-                Region: {wh['region']}<br>
-                Fixed Cost: ${wh['fixed_cost_annual']:,.0f}/year
-                """
-            else:
-                color = 'lightgray'
-                icon = 'warehouse'
-                prefix = 'fa'
-                popup_text = f"""
-                <b>❌ CLOSED</b><br>
-                <b>{wh['warehouse']}</b><br>
-                Region: {wh['region']}<br>
-                Cost: ${wh['fixed_cost_annual']:,.0f}/year
-                """
-            
-            folium.Marker(
-                location=[wh['lat'], wh['lon']],
-                popup=folium.Popup(popup_text, max_width=300),
-                tooltip=wh['warehouse'],
-                icon=folium.Icon(color=color, icon=icon, prefix=prefix)
+        for is_open, color in [(True, 'green'), (False, 'lightgray')]:
+            if not warehouse_features[is_open]:
+                continue
+            folium.GeoJson(
+                feature_collection(warehouse_features[is_open]),
+                marker=folium.Marker(icon=folium.Icon(color=color, icon='warehouse', prefix='fa')),
+                popup=folium.GeoJsonPopup(fields=['popup'], labels=False, max_width=300),
+                tooltip=folium.GeoJsonTooltip(fields=['name'], labels=False)
             ).add_to(m)
         
         # Add customer locations
-        customer_locations = self.demand_df[['city', 'lat', 'lon']].drop_duplicates()
-        
-        for _, cust in customer_locations.iterrows():
-            # Get demand for this customer
-            total_demand = self.demand_df[self.demand_df['city'] == cust['city']]['demand'].sum()
-            
-            popup_text = f"""
-            <b>📍 Customer City</b><br>
-            <b>{cust['city']}</b><br>
-            Annual Demand: {total_demand:,.0f} orders
-            """
-            
-            folium.CircleMarker(
-                location=[cust['lat'], cust['lon']],
-                radius=5,
-                popup=folium.Popup(popup_text, max_width=250),
-                tooltip=cust['city'],
-                color='blue',
-                fill=True,
-                fillColor='lightblue',
-                fillOpacity=0.6
-            ).add_to(m)
+        # Customers are clustered client-side: rows are shipped as one JS array
+        # and Leaflet only builds markers for clusters expanded into view
+        customer_callback = """
+        function (row) {
+            return L.circleMarker(new L.LatLng(row[0], row[1]), {
+                radius: 5, color: 'blue', fill: true, fillColor: 'lightblue', fillOpacity: 0.6
+            }).bindPopup(row[2], {maxWidth: 250}).bindTooltip(row[3]);
+        }
+        """
+        plugins.FastMarkerCluster(customer_points, callback=customer_callback).add_to(m)
         
         # Add routes (lines from warehouses to customers)
-        routes_df = self.solution['routes']
-        
-        for _, route in routes_df.iterrows():
-            # Get coordinates
-            wh_row = self.warehouse_df[self.warehouse_df['warehouse'] == route['warehouse']].iloc[0]
-            cust_row = customer_locations[customer_locations['city'] == route['customer']].iloc[0]
-            
-            # Line thickness based on shipment volume
-            weight = min(route['shipments'] / 5000, 5)  # Scale for visibility
-            
-            folium.PolyLine(
-                locations=[
-                    [wh_row['lat'], wh_row['lon']],
-                    [cust_row['lat'], cust_row['lon']]
-                ],
-                color='red',
-                weight=weight,
-                opacity=0.4,
-                popup=f"{route['warehouse']} → {route['customer']}<br>Shipments: {route['shipments']:,.0f}",
-                tooltip=f"{route['shipments']:,.0f} shipments"
+        if route_features:
+            folium.GeoJson(
+                feature_collection(route_features),
+                style_function=lambda f: {
+                    'color': 'red',
+                    'weight': f['properties']['weight'],
+                    'opacity': 0.4
+                },
+                popup=folium.GeoJsonPopup(fields=['popup'], labels=False),
+                tooltip=folium.GeoJsonTooltip(fields=['tooltip'], labels=False)
             ).add_to(m)
         
         # Add legend
@@ -150,7 +283,6 @@ class NetworkVisualizer:
         <p style="margin:5px 0; font-size:12px">Line width = shipment volume</p>
         </div>
         '''
-        m.get_root().html.add_child(folium.Element(legend_html))
         
         # Add title
         title_html = '''
@@ -167,12 +299,16 @@ class NetworkVisualizer:
         '''.format(
             self.solution['total_cost'],
             self.solution['num_warehouses'],
-            len(routes_df)
+            len(self.routes_df)
         )
-        m.get_root().html.add_child(folium.Element(title_html))
+        
+        # Legend and title go in as one static element
+        m.get_root().html.add_child(folium.Element(legend_html + title_html))
         
         # Save map
-        m.save(output_file)
+        os.makedirs(os.path.dirname(output_file), exist_ok=True)
+        with open(output_file, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            f.write(m.get_root().render())
         print(f"✅ Map saved to: {output_file}")
         print(f"   Open in browser to view!")
         
@@ -196,16 +332,25 @@ class NetworkVisualizer:
         print("📊 NETWORK VISUALIZATION SUMMARY")
         print("=" * 70)
         
-        routes_df = self.solution['routes']
+        routes_df = self.routes_df
+        
+        # One pass over the shipments column: totals, and an O(N) top-5 selection
+        shipments = routes_df['shipments'].to_numpy()
+        num_routes = shipments.size
+        total_shipments = shipments.sum()
+        k = min(5, num_routes)
+        top_idx = np.argpartition(shipments, num_routes - k)[num_routes - k:] if k else []
+        top_idx = sorted(top_idx, key=lambda i: shipments[i], reverse=True)
         
         print(f"\n🏭 Warehouse Configuration:")
         print(f"   Open Warehouses: {self.solution['num_warehouses']}")
         print(f"   Locations: {', '.join(self.solution['open_warehouses'])}")
         
         print(f"\n📦 Routing Statistics:")
-        print(f"   Total Routes: {len(routes_df)}")
-        print(f"   Total Shipments: {routes_df['shipments'].sum():,.0f}")
-        print(f"   Avg Shipments/Route: {routes_df['shipments'].mean():,.0f}")
+        print(f"   Total Routes: {num_routes}")
+        print(f"   Total Shipments: {total_shipments:,.0f}")
+        avg_shipments = total_shipments / num_routes if num_routes else 0.0
+        print(f"   Avg Shipments/Route: {avg_shipments:,.0f}")
         
         print(f"\n💰 Cost Breakdown:")
         print(f"   Fixed Costs:     ${self.solution['fixed_cost']:,.0f}/year")
@@ -214,9 +359,9 @@ class NetworkVisualizer:
         
         # Top routes by volume
         print(f"\n🚚 Top 5 Routes by Volume:")
-        top_routes = routes_df.nlargest(5, 'shipments')
-        for idx, route in top_routes.iterrows():
-            print(f"   {route['warehouse']:20s} → {route['customer']:15s}  {route['shipments']:8,.0f} shipments")
+        top_routes = routes_df.iloc[top_idx]
+        for route in top_routes.itertuples(index=False):
+            print(f"   {route.warehouse:20s} → {route.customer:15s}  {route.shipments:8,.0f} shipments")
 
 
 # ==========================================
@@ -242,4 +387,4 @@ if __name__ == "__main__":
     print("\n" + "=" * 70)
     print("🎉 Visualization Complete!")
     print("=" * 70)
-    print("\n💡 Next step: Open 'dashboards/network_map.html' in your browser!")
\ No newline at end of file
+    print("\n💡 Next step: Open 'dashboards/static/network_map.html' in your browser!")
\ No newline at end of file
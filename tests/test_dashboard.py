@@ -0,0 +1,77 @@
+"""
+LogiFlow - Dashboard tests
+Render the Streamlit app against a stubbed API and check the Business Impact tab
+"""
+
+import json
+from unittest import mock
+
+import requests
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+IMPLEMENTATION_COST = 50000
+
+def make_bundle(baseline_cost, total_cost):
+    """Minimal /dashboard-bundle payload for the given costs"""
+    savings = baseline_cost - total_cost
+    return {
+        "solution": {
+            "open_warehouses": ["Dallas_TX"],
+            "num_warehouses": 1,
+            "total_cost": total_cost,
+            "fixed_cost": total_cost / 2,
+            "variable_cost": total_cost / 2,
+            "baseline_cost": baseline_cost,
+            "annual_savings": savings,
+            "savings_percentage": round(savings / baseline_cost * 100, 2),
+            "num_routes": 1,
+        },
+        "warehouses": {"warehouses": []},
+        "cost_breakdown": {},
+        "metrics": {
+            "cost_metrics": {"annual_savings": savings,
+                             "savings_percentage": round(savings / baseline_cost * 100, 2)},
+            "network_metrics": {"num_warehouses": 1, "num_routes": 1},
+        },
+        "demand": {},
+        "scenarios": {},
+    }
+
+def render(bundle):
+    """Run the dashboard with every API GET answered from `bundle`"""
+    def fake_get(self, url, **kwargs):
+        response = requests.Response()
+        response.status_code = 200
+        payload = bundle["metrics"] if url.endswith("/metrics") else bundle
+        response._content = json.dumps(payload).encode()
+        return response
+
+    # API responses are memoized by st.cache_data; start each render clean
+    st.cache_data.clear()
+    with mock.patch.object(requests.Session, "get", fake_get):
+        at = AppTest.from_file("../dashboards/app.py", default_timeout=30)
+        at.run()
+    return at
+
+def metric(at, label):
+    """Value of the last st.metric with this label"""
+    return [m.value for m in at.metric if m.label == label][-1]
+
+def test_business_impact_renders_roi_and_payback():
+    at = render(make_bundle(baseline_cost=22_667_407, total_cost=3_467_407))
+
+    annual_savings = 22_667_407 - 3_467_407
+    errors = [e.value for e in at.error]
+    assert not any("business impact" in e for e in errors), errors
+    assert metric(at, "Annual Cost") == "$3,467,407"
+    assert metric(at, "ROI") == f"{annual_savings / IMPLEMENTATION_COST * 100:,.0f}%"
+    assert metric(at, "Payback Period") == f"{IMPLEMENTATION_COST / annual_savings * 12:.1f} months"
+
+def test_business_impact_zero_savings_has_no_payback():
+    at = render(make_bundle(baseline_cost=22_667_407, total_cost=22_667_407))
+
+    errors = [e.value for e in at.error]
+    assert not any("business impact" in e for e in errors), errors
+    assert metric(at, "ROI") == "0%"
+    assert metric(at, "Payback Period") == "N/A"